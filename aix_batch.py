@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# AIx — batch reports for many founder requests (--batch requests.jsonl)
+# One JSON object per line:
+#   {"id": "acme", "country": "CH", "target": "800k", "stage": "preseed",
+#    "dataset": "OpenVC.csv", "topn": 20, "tier": "A"}
+# country is required; target defaults to the country's default scenario, dataset to
+# --input, topn / tier to the CLI values; stage (preseed / seed) restricts the funds.
+# Requests sharing (dataset, country) form one group: each dataset is read once, each
+# group scored once over the union of its targets and indexed (aix_query.QueryIndex);
+# targets that round to the same label (700000 / 700400 -> '700k') get their own pass.
+# Every request then gets its Top-N and A/B/C/U summary at its own target from that
+# index, computed and written on a bounded pool of asyncio worker threads:
+#   <out>/<id>/aix_tiers_<slug>_v4.csv, <out>/<id>/aix_tiers_<slug>_summary_v4.csv
+# plus <out>/batch_manifest.csv (one row per request: status, files, rows).
+
+import asyncio, json, re, time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from aix_builder import (column, get_country, label_for, parse_targets, load_investors, select_country, score_table,
+                         top_table, summary_rows, write_csv)
+from aix_query import QueryIndex, STAGE_CLASSES
+
+MANIFEST_COLUMNS = ["id","country","target","stage","dataset","status","top_rows","top_out","summary_out","error"]
+
+# ---------- requests ----------
+def read_requests(path, default_input, topn=20, tier="A") -> list:
+    """Parse and validate the JSONL; invalid lines come back with an "error"."""
+    reqs, seen = [], set()
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            req = {"id": str(n), "line": n}
+            try:
+                raw = json.loads(line)
+                req["id"] = re.sub(r"[^\w.-]+", "_", str(raw.get("id", n))).strip("._") or str(n)
+                table = get_country(str(raw["country"]))
+                req["country"] = str(raw["country"]).upper()
+                target = raw.get("target")
+                t = parse_targets(str(target), default=()) if target is not None else (table["default_target"],)
+                if len(t) != 1 or t[0] <= 0:
+                    raise ValueError(f"invalid target {target!r}")
+                req["target"] = t[0]
+                req["stage"] = str(raw["stage"]).lower().replace("-", "").replace(" ", "") if raw.get("stage") else ""
+                if req["stage"] and req["stage"] not in STAGE_CLASSES:
+                    raise ValueError(f"unknown stage {raw['stage']!r} (use {', '.join(STAGE_CLASSES)})")
+                req["dataset"] = str(raw.get("dataset") or default_input)
+                req["topn"] = int(raw.get("topn", topn))
+                req["tier"] = str(raw.get("tier", tier))
+                if req["tier"] not in ("A", "B", "C", "any"):
+                    raise ValueError(f"unknown tier {req['tier']!r}")
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                req["error"] = f"line {n}: {e!r}" if isinstance(e, KeyError) else f"line {n}: {e}"
+            if req["id"] in seen:
+                req["id"] = f"{req['id']}_{n}"
+            seen.add(req["id"])
+            reqs.append(req)
+    return reqs
+
+def group_requests(reqs) -> dict:
+    """{(dataset, country): [requests]} for the valid requests, in file order."""
+    groups = defaultdict(list)
+    for r in reqs:
+        if "error" not in r:
+            groups[(r["dataset"], r["country"])].append(r)
+    return dict(groups)
+
+# ---------- per group / per request ----------
+def score_group(inv: dict, code: str, targets) -> dict:
+    """Score one country over its unique targets -> {target: (score_table columns as
+    arrays, QueryIndex)}. Columns are named by label_for, so targets sharing a label
+    (700000 and 700400 are both '700k') go to separate passes; usually there is one."""
+    passes = []                                              # [{label: target}]
+    for t in sorted(set(targets)):
+        lab = label_for(t)
+        free = next((p for p in passes if lab not in p), None)
+        if free is None:
+            free = {}; passes.append(free)
+        free[lab] = t
+    base, out = select_country(inv, code), {}
+    for p in passes:
+        table = score_table(base, code, list(p.values()))
+        table = {k: column(table, k) for k in table}         # converted once, not per request
+        idx = QueryIndex(table)
+        out.update((t, (table, idx)) for t in p.values())
+    return out
+
+def request_report(table: dict, idx: QueryIndex, req: dict, out_dir) -> dict:
+    """Top-N and summary of one request at its target, written under <out_dir>/<id>/."""
+    lab, stage = label_for(req["target"]), req["stage"] or None
+    tier = None if req["tier"] == "any" else req["tier"]
+    hit = idx.query(scenario=lab, limit=req["topn"], columns=[], stage=stage, tier=tier)
+    rows = hit["row"]
+    if req["tier"] == "any":                               # scored tiers only, as in top_by_tier
+        rows = rows[np.asarray(hit[f"tier_{lab}"], dtype=object) != "U"]
+    top = top_table(table, [lab], rows, np.zeros(len(rows), dtype=np.int64), np.arange(1, len(rows) + 1))
+    counts = {lab: {t: idx.count(scenario=lab, tier=t, stage=stage) for t in "ABCU"}}
+    summary = summary_rows([lab], counts)
+
+    slug = get_country(req["country"])["slug"]
+    d = Path(out_dir) / req["id"]
+    d.mkdir(parents=True, exist_ok=True)
+    top_out, summary_out = d / f"aix_tiers_{slug}_v4.csv", d / f"aix_tiers_{slug}_summary_v4.csv"
+    write_csv(top, top_out)
+    write_csv({k: [r[k] for r in summary] for k in ("scenario", "tier", "count", "percent")}, summary_out)
+    return {"status": "ok", "top_rows": len(rows), "top_out": str(top_out), "summary_out": str(summary_out)}
+
+# ---------- batch ----------
+async def run_batch(reqs, out_dir, jobs=8, cache=True, cache_dir=None) -> list:
+    """Load each dataset once, score each group once, then the per-request reports on
+    at most jobs threads -> manifest rows (file order)."""
+    groups = group_requests(reqs)
+    results = {r["id"]: {"status": "error", "error": r["error"]} for r in reqs if "error" in r}
+
+    datasets = defaultdict(set)
+    for (dataset, code) in groups:
+        datasets[dataset].update(get_country(code)["types"])
+    loaded = await asyncio.gather(*(asyncio.to_thread(load_investors, d, types, cache, cache_dir)
+                                    for d, types in datasets.items()), return_exceptions=True)
+    invs = dict(zip(datasets, loaded))
+
+    sem = asyncio.Semaphore(max(1, jobs))
+    async def report(table, idx, req):
+        async with sem:
+            try:
+                results[req["id"]] = await asyncio.to_thread(request_report, table, idx, req, out_dir)
+            except (OSError, KeyError, ValueError) as e:
+                results[req["id"]] = {"status": "error", "error": str(e)}
+
+    async def group(key, members):
+        inv = invs[key[0]]
+        try:
+            if isinstance(inv, BaseException):
+                raise inv
+            async with sem:
+                scored = await asyncio.to_thread(score_group, inv, key[1], [r["target"] for r in members])
+        except (OSError, KeyError, ValueError) as e:
+            for r in members:
+                results[r["id"]] = {"status": "error", "error": f"{key[0]}: {e}"}
+            return
+        await asyncio.gather(*(report(*scored[r["target"]], r) for r in members))
+
+    await asyncio.gather(*(group(k, m) for k, m in groups.items()))
+    return [{c: {**r, **results[r["id"]]}.get(c, "") for c in MANIFEST_COLUMNS} for r in reqs]
+
+def batch_build(path, out_dir, default_input, topn=20, tier="A", jobs=8, cache=True, cache_dir=None) -> list:
+    """read_requests + run_batch + manifest; prints one summary line."""
+    t = time.perf_counter()
+    reqs = read_requests(path, default_input, topn, tier)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    manifest = asyncio.run(run_batch(reqs, out_dir, jobs, cache, cache_dir))
+    out = Path(out_dir) / "batch_manifest.csv"
+    write_csv({c: [m[c] for m in manifest] for c in MANIFEST_COLUMNS}, out)
+    ok = sum(m["status"] == "ok" for m in manifest)
+    print(f"[Batch] {ok}/{len(reqs)} requests in {len(group_requests(reqs))} scoring pass(es), "
+          f"{time.perf_counter() - t:.2f}s -> {out}")
+    return manifest
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# AIx — reproducible benchmark of the pipeline stages on synthetic OpenVC-shaped data
+# Generates seeded CSVs of the requested sizes (messy cheque strings in mixed
+# currencies, multi-line quoted theses, the OpenVC header and type mix), then times
+# the code paths the CLI runs: parse_money_column, read_investors, the country filter,
+# the pandas-free build (build_tables / score_table), Top-N, summary and the write_csv
+# writes, for several scenario counts. Each stage is the best of --repeat runs;
+# its peak traced allocation comes from one extra run under tracemalloc.
+# Results go to a JSON baseline; --baseline compares against a stored one and exits
+# non-zero when a stage got slower (or hungrier) than --tolerance allows.
+# --startup times fresh interpreters on the CLI entry points (--help, bare import, a
+# small build) against STARTUP_BUDGET_S and fails if one of them imports pandas.
+# Usage:
+#   python aix_bench.py --sizes 1k,10k,100k --scenarios 3,10 --save bench.json
+#   python aix_bench.py --sizes 1k,10k,100k --scenarios 3,10 --baseline bench.json
+#   python aix_bench.py --sizes 1k --startup
+
+import argparse, csv, json, os, platform, random, resource, subprocess, sys, tempfile, time, tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aix_builder import (parse_money, parse_money_column, parse_targets, read_investors, build_tables,
+                         select_country, score_table, top_selection, top_table, tier_counts, summary_rows,
+                         label_for, write_csv, parse_countries)
+
+HEADER = ["\ufeffInvestor name","Website","Global HQ","Countries of investment","Stage of investment",
+          "Investment thesis","Investor type","First cheque minimum","First cheque maximum"]
+
+# ---------- synthetic OpenVC ----------
+_HQ = ["Paris, France","75008 Paris","Lyon, Auvergne-Rhône-Alpes, France","Zurich, Switzerland",
+       "Bahnhofstrasse 18, 8001 Zürich","Geneva","Berlin, Germany","München","Stockholm, Sweden",
+       "Oslo, Norway","Copenhagen","Helsinki, Finland","London, UK","New York, New York, United States",
+       "USA","San Francisco, California, United States","Singapore","Tel Aviv, Israel",""]
+_COUNTRIES = ["France","Switzerland","Germany","Austria","Sweden","Norway","Denmark","Finland","UK",
+              "USA","Israel","Canada","Spain","Italy","Netherlands","Europe","DACH","Nordics","Japan"]
+_STAGES = ["1. Idea or Patent","2. Prototype","3. Early Revenue","4. Scaling","5. Growth","6. Pre-IPO"]
+_TYPES = (["VC"] * 40 + ["Solo angel"] * 15 + ["Corporate VC"] * 8 + ["Other"] * 8 + ["Angel network"] * 8
+          + ["Family office"] * 6 + ["Accelerator"] * 5 + ["Incubator"] * 4 + ["Startup studio"] * 3
+          + ["Private equity"] * 2 + ["Public fund"])
+_SECTORS = ["fintech","SaaS","deeptech","climate","health","B2B software","marketplaces","AI","robotics"]
+
+def _cheque(rng: random.Random, lo: int) -> str:
+    """One first-cheque cell, in one of the spellings found in exports."""
+    v = rng.choice([25, 50, 100, 150, 250, 300, 500, 750, 1000, 1500, 2000, 5000, 10000]) * 1000
+    v = max(v, lo)
+    style = rng.randrange(12)
+    if style == 0: return ""
+    if style == 1: return f"${v}"
+    if style == 2: return f"€{v // 1000}k"
+    if style == 3: return f"CHF {v:,}".replace(",", " ")
+    if style == 4: return f"USD {v:,}"
+    if style == 5: return f"{v / 1e6:g}M"
+    if style == 6: return f"£{v // 1000}K"
+    if style == 7: return f"{v / 1e6:g}".replace(".", ",") + "m EUR"
+    if style == 8: return "n/a"
+    return f"${v}"
+
+def _row(rng: random.Random, i: int) -> list:
+    name = f"{rng.choice(['Alpine','Nordic','Seine','Rhein','Baltic','Atlas','Helix'])} {rng.choice(['Ventures','Capital','Partners','Invest'])} {i}"
+    stages = sorted(rng.sample(_STAGES, rng.randint(0, 4)))
+    lines = [f"We invest in {', '.join(rng.sample(_SECTORS, 3))} across {rng.choice(['Europe','DACH','the Nordics','France'])}."]
+    lines += [f'Line {k}: "hands-on", ticket, follow-on' for k in range(rng.randint(0, 3))]
+    lo = _cheque(rng, 0)
+    return [name, f"https://{name.lower().replace(' ', '')}.vc/" if rng.random() < 0.9 else "",
+            rng.choice(_HQ), ",".join(rng.sample(_COUNTRIES, rng.randint(0, 6))), ",".join(stages),
+            "\n".join(lines), rng.choice(_TYPES), lo, _cheque(rng, parse_money(lo))]
+
+def synth_openvc(path, rows: int, seed=0) -> Path:
+    """Write a seeded OpenVC-shaped CSV of rows data rows (same bytes for the same seed)."""
+    rng, path = random.Random(seed), Path(path)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        for start in range(0, rows, 10_000):
+            w.writerows(_row(rng, i) for i in range(start, min(rows, start + 10_000)))
+    return path
+
+# ---------- timing ----------
+def measure(fn, repeat=3) -> dict:
+    """Best wall time of repeat calls, plus peak traced allocation of one more call."""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_mb": peak / 2**20}
+
+def bench_size(path, rows: int, countries, scenario_counts, repeat=3, out_dir=None) -> dict:
+    """Every stage on one synthetic file -> {stage key: {seconds, rows_per_s, peak_mb, rows}}."""
+    res = {}
+    def rec(key, fn, n):
+        r = measure(fn, repeat); r["rows"] = n
+        r["rows_per_s"] = n / r["seconds"] if r["seconds"] > 0 else None
+        res[key] = r
+        print(f"[Bench] {rows:>9} {key:<28} {r['seconds']*1000:10.2f} ms  {r['peak_mb']:8.1f} MB")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        raw = [c for row in csv.DictReader(f) for c in (row["First cheque minimum"], row["First cheque maximum"])]
+    rec("parse_money_column", lambda: parse_money_column(raw), len(raw))
+    rec("read_investors", lambda: read_investors(path), rows)
+    inv = read_investors(path)
+    codes = parse_countries(countries)
+    for code in codes:
+        rec(f"select_country/{code}", lambda: select_country(inv, code), len(inv["name"]))
+    rec(f"build_tables/{len(codes)}c", lambda: build_tables(path, codes, cache=False), rows)
+
+    out = Path(out_dir or tempfile.mkdtemp(prefix="aix_bench_"))
+    for code in codes:
+        base = select_country(inv, code)
+        n = len(base["name"])
+        for k in scenario_counts:
+            targets = tuple(int(t) for t in np.linspace(100_000, 5_000_000, k).round(-3))
+            labs = [label_for(t) for t in targets]
+            table = score_table(base, code, targets)
+            rec(f"score/{code}/{k}s", lambda: score_table(base, code, targets), n)
+            rec(f"top_n/{code}/{k}s", lambda: top_table(table, labs, *top_selection(table, labs, 20, "A")), n)
+            rec(f"summary/{code}/{k}s", lambda: summary_rows(labs, tier_counts(table, labs)), n)
+            rec(f"write_csv/{code}/{k}s", lambda: write_csv(table, out / f"{code}_{k}.csv"), n)
+    return res
+
+# ---------- startup ----------
+STARTUP_BUDGET_S = {"help": 0.35, "import": 0.30, "build": 0.60}     # wall, fresh interpreter included
+_HERE = Path(__file__).resolve().parent
+
+def startup_commands(csv_path=None, out_dir=None) -> dict:
+    cmds = {f"help/{m}": [f"{m}.py", "--help"] for m in ("aix_builder", "aix_builder_fr", "aix_builder_sw")}
+    cmds["import/aix_builder"] = ["-c", "import aix_builder"]
+    if csv_path:
+        out = out_dir or tempfile.mkdtemp(prefix="aix_startup_")
+        cmds["build/aix_builder"] = ["aix_builder.py", "--input", str(csv_path), "--countries", "FR",
+                                     "--out", str(out), "--no-cache"]
+    return cmds
+
+def startup(csv_path=None, repeat=5) -> dict:
+    """Best wall time of fresh `python <cmd>` runs per entry point (cwd = repo), plus
+    whether pandas was imported (one extra run under -X importtime)."""
+    res = {}
+    for key, cmd in startup_commands(csv_path).items():
+        best = float("inf")
+        for _ in range(repeat):
+            t = time.perf_counter()
+            subprocess.run([sys.executable, *cmd], cwd=_HERE, capture_output=True, check=True)
+            best = min(best, time.perf_counter() - t)
+        log = subprocess.run([sys.executable, "-X", "importtime", *cmd], cwd=_HERE, capture_output=True, text=True,
+                             env=dict(os.environ, PYTHONWARNINGS="ignore")).stderr
+        pandas = any(line.rstrip().endswith("| pandas") for line in log.splitlines())
+        res[f"startup/{key}"] = {"seconds": best, "pandas": pandas}
+        print(f"[Startup] {key:<26} {best*1000:10.2f} ms" + ("  (imports pandas)" if pandas else ""))
+    return res
+
+def over_budget(results: dict, budget=STARTUP_BUDGET_S) -> list:
+    """Startup entries slower than their budget or importing pandas."""
+    bad = []
+    for key, r in results.items():
+        if not key.startswith("startup/"):
+            continue
+        limit = budget.get(key.split("/")[1])
+        if r["pandas"] or (limit is not None and r["seconds"] > limit):
+            bad.append({"stage": key, "seconds": r["seconds"], "budget": limit, "pandas": r["pandas"]})
+    return bad
+
+# ---------- baseline ----------
+def environment() -> dict:
+    return {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "machine": platform.machine(), "system": platform.system(), "processor": platform.processor()}
+
+_NOISE = {"seconds": 0.002, "peak_mb": 1.0}      # absolute slack: ignore sub-ms / sub-MB jitter
+
+def compare(results: dict, baseline: dict, tolerance=0.25) -> list:
+    """Stages slower (or with a higher traced peak) than baseline × (1 + tolerance)."""
+    flagged = []
+    for key, r in results.items():
+        b = baseline.get("results", {}).get(key)
+        if not b:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if metric not in r or metric not in b:
+                continue
+            if r[metric] > b[metric] * (1 + tolerance) + _NOISE[metric]:
+                flagged.append({"stage": key, "metric": metric, "baseline": b[metric], "now": r[metric],
+                                "ratio": r[metric] / b[metric] if b[metric] else float("inf")})
+    return flagged
+
+# ---------- CLI ----------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="AIx stage benchmarks on synthetic OpenVC data")
+    p.add_argument("--sizes", default="1k,10k,100k", help="Row counts, e.g. '1k,10k,100k,1M,10M'")
+    p.add_argument("--scenarios", default="3,10", help="Scenario counts to score, e.g. '3,10,50'")
+    p.add_argument("--countries", default="FR,CH", help="Countries filtered and scored")
+    p.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best kept)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--data-dir", default=None, help="Keep the synthetic CSVs here (reused when present)")
+    p.add_argument("--save", default=None, help="Write results as a JSON baseline")
+    p.add_argument("--baseline", default=None, help="Compare against this JSON baseline")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = +25%%)")
+    p.add_argument("--startup", action="store_true",
+                   help="Also time CLI startup (--help, import, small build) against STARTUP_BUDGET_S")
+    p.add_argument("--startup-only", action="store_true", help="Only the startup checks (no stage benchmarks)")
+    args = p.parse_args(argv)
+
+    sizes = parse_targets(args.sizes, default=())
+    counts = [int(s) for s in args.scenarios.split(",") if s.strip()]
+    data = Path(args.data_dir or tempfile.mkdtemp(prefix="aix_bench_data_"))
+    data.mkdir(parents=True, exist_ok=True)
+
+    results, paths = {}, []
+    for n in sizes:
+        path = data / f"openvc_synth_{n}_s{args.seed}.csv"
+        if not path.exists():
+            t = time.perf_counter(); synth_openvc(path, n, args.seed)
+            print(f"[Synth] {n} rows in {time.perf_counter() - t:.1f}s -> {path}")
+        paths.append(path)
+        if not args.startup_only:
+            for key, r in bench_size(path, n, args.countries, counts, args.repeat).items():
+                results[f"{n}/{key}"] = r
+    busted = []
+    if args.startup or args.startup_only:
+        results.update(startup(paths[0].resolve() if paths else None, repeat=max(args.repeat, 3)))
+        busted = over_budget(results)
+        for b in busted:
+            print(f"[Budget] {b['stage']}: {b['seconds']*1000:.0f} ms (budget {b['budget']*1000:.0f} ms)"
+                  + (", imports pandas" if b["pandas"] else ""))
+
+    report = {"environment": environment(), "seed": args.seed, "repeat": args.repeat,
+              "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "results": results}
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2))
+        print(f"[Bench] wrote {len(results)} stage timings -> {args.save}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("environment") != report["environment"]:
+            print("[Bench] note: baseline recorded on another environment")
+        flagged = compare(results, baseline, args.tolerance)
+        for f in flagged:
+            print(f"[Regression] {f['stage']} {f['metric']}: {f['baseline']:.4g} -> {f['now']:.4g} (x{f['ratio']:.2f})")
+        print(f"[Bench] {len(flagged)} regression(s) vs {args.baseline}")
+        if flagged:
+            sys.exit(1)
+    if busted:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
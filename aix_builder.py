@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+# AIx — multi-country builder (one read of the OpenVC CSV, every country in the same pass)
+# Usage:
+#   python aix_builder.py --input OpenVC.csv --countries FR,CH,DE \
+#     --targets "300k,800k,1.5M" --out ./out --topn 20
+# Without --targets each country uses its own default scenarios (see aix_countries.py).
+# Writes per country: aix_<name>_v4.csv, aix_tiers_<slug>_v4.csv, aix_tiers_<slug>_summary_v4.csv
+# The default build (parse, filter, score, Top-N, CSV writes) runs on the stdlib + NumPy;
+# pandas is imported only by the functions that return DataFrames and the optional modes.
+
+from __future__ import annotations
+
+import csv, math, numpy as np, os, re, argparse
+from contextlib import nullcontext
+from pathlib import Path
+
+from aix_core import score_matrix, as_column, rank_keys, top_n
+from aix_cache import cached_table
+import aix_profile
+from aix_sweep import sweep_long, tier_a_intervals, anchors_covering
+from aix_countries import (COUNTRIES, get_country, parse_countries, locate, focus_from_hits, score_masks, score_stages,
+                           stage_masks)
+
+DEFAULT_INPUT = "OpenVC.csv"
+
+# ---------- helpers ----------
+def norm(col: str) -> str:
+    return col.replace("\ufeff", "").strip().lower().replace(" ", "_")
+
+def parse_money(txt) -> int:
+    """Parse '€250k', '1.2m', 'CHF 300 000' -> int (units)."""
+    return _parse_money(txt)[0]
+
+def _parse_money(txt) -> tuple:
+    """parse_money + how it went -> (units, status): 'ok', 'empty', 'partial' (digits
+    salvaged from unexpected text) or 'unparseable' (nothing numeric, counted as 0)."""
+    if not txt: return 0, "empty"
+    s = str(txt).lower().strip()
+    for tok in ["eur","chf","usd","gbp","€","$","£"]:
+        s = s.replace(tok, "")
+    s = s.replace(" ", "")
+    unit = None
+    if s.endswith("m"): unit, s = "m", s[:-1]
+    elif s.endswith("k"): unit, s = "k", s[:-1]
+    s = re.sub(r"(?<=\d)[, ](?=\d{3}\b)", "", s)  # thousands sep
+    s = s.replace(",", ".")                       # decimal comma -> dot
+    status = "ok"
+    try:
+        val = float(s)
+    except Exception:
+        digits = re.sub(r"[^\d.]", "", s)
+        try:
+            val, status = float(digits), "partial"
+        except ValueError:
+            return 0, "unparseable"
+    if unit == "m": val *= 1_000_000
+    if unit == "k": val *= 1_000
+    if not math.isfinite(val) or abs(val) >= 2**62:  # 'nan', 'inf', '1e999' (int64 columns)
+        return 0, "unparseable"
+    return int(round(val)), status
+
+def parse_money_column(values) -> tuple:
+    """parse_money over a whole column, each distinct string parsed once.
+
+    Returns (int64 array, issues) with issues = {raw: (units, status, rows)} for the
+    'partial' and 'unparseable' strings.
+    """
+    uniq = {}
+    codes = np.fromiter((uniq.setdefault(v, len(uniq)) for v in values), dtype=np.int64, count=len(values))
+    parsed = [_parse_money(v) for v in uniq]
+    rows = np.bincount(codes, minlength=len(uniq))
+    issues = {v: (u, st, int(rows[i])) for i, (v, (u, st)) in enumerate(zip(uniq, parsed))
+              if st in ("partial", "unparseable")}
+    return np.array([u for u, _ in parsed], dtype=np.int64)[codes], issues
+
+def parse_targets(txt: str, default=(250_000, 700_000, 1_200_000)):
+    """Supports '250000,700000,1200000' or '250k,700k,1.2M'."""
+    out=[]
+    for tok in str(txt).split(","):
+        t = tok.strip().lower()
+        if not t:
+            continue
+        mult = 1
+        if t.endswith("m"): mult, t = 1_000_000, t[:-1]
+        elif t.endswith("k"): mult, t = 1_000, t[:-1]
+        t = t.replace(" ", "").replace(",", ".")
+        try:
+            out.append(int(round(float(t) * mult)))
+        except ValueError:
+            pass
+    return tuple(out) if out else default
+
+def parse_sweep(txt: str) -> np.ndarray:
+    """'100k:5M:25k' -> every target from start to stop (inclusive) by step."""
+    parts = [parse_targets(p, default=()) for p in str(txt).split(":")]
+    if len(parts) != 3 or any(len(v) != 1 for v in parts):
+        raise ValueError(f"sweep must be START:STOP:STEP, got '{txt}'")
+    (start,), (stop,), (step,) = parts
+    if step <= 0 or stop < start:
+        raise ValueError(f"invalid sweep '{txt}'")
+    return np.arange(start, stop + 1, step, dtype=np.int64)
+
+def label_for(target: int) -> str:
+    """300000 -> '300k', 1500000 -> '1500k'."""
+    return f"{int(round(target/1000))}k"
+
+# ---------- scalar reference scoring (one investor, one target) ----------
+def score_anchor_capacity(max_cheque: int, target_raise: int, sf: int) -> int:
+    """AC (0–30) — capacity to cover the target; capped at 15 unless explicitly early."""
+    if not max_cheque or max_cheque <= 0:
+        base = 0
+    else:
+        ratio = max_cheque / float(target_raise)
+        base = 30 if ratio >= 1 else int(round(ratio * 30))
+    if sf < 20:
+        base = min(base, 15)
+    return base
+
+def score_flex(min_cheque: int, max_cheque: int, target_raise: int) -> int:
+    """FS (0–25) — overlap of the range with the band [0.6×target ; 1.1×target]."""
+    if not (min_cheque and max_cheque) or max_cheque <= 0 or min_cheque < 0 or max_cheque < min_cheque:
+        return 0
+    lower, upper = 0.6*target_raise, 1.1*target_raise
+    overlap = max(0.0, min(max_cheque, upper) - max(min_cheque, lower))
+    band = (upper - lower)
+    return int(round(25 * (overlap / band))) if band > 0 else 0
+
+def confidence_flag(has_min: bool, has_max: bool, has_stage: bool, has_countries: bool) -> str:
+    score = sum([has_min, has_max, has_stage, has_countries])
+    if score >= 4: return "high"
+    if score >= 2: return "mid"
+    return "low"
+
+def malus_from_confidence(flag: str) -> int:
+    return {"high": 0, "mid": -5, "low": -10}.get(flag, -5)
+
+def assign_tier(aix):
+    if aix is None: return "U"   # Unscored
+    if aix >= 75: return "A"
+    if aix >= 55: return "B"
+    return "C"
+
+def is_unscored(min_c: int, max_c: int) -> bool:
+    """Tier U when min AND max are missing/0."""
+    return (min_c is None or min_c <= 0) and (max_c is None or max_c <= 0)
+
+# ---------- core ----------
+PARSER_VERSION = 2      # bump whenever read_investors / parse_money output changes (invalidates aix_cache)
+
+INVESTOR_FIELDS = ["name","website","type","hq_raw","countries_raw","stage_raw",
+                   "cheque_min","cheque_max","confidence","malus"]
+
+def _parse_row(inv: dict, row: dict, col: dict, types=None) -> None:
+    """Append one raw CSV row to the column lists (skipped if its type is not in types).
+    Cheques stay raw strings until finish_investors()."""
+    inv_type = (row.get(col.get("investor_type",""), "") or "").strip().lower()
+    if types is not None and inv_type not in types:
+        return
+    inv["name"].append(row.get(col.get("investor_name",""), ""))
+    inv["website"].append(row.get(col.get("website",""), ""))
+    inv["type"].append(inv_type)
+    inv["hq_raw"].append(row.get(col.get("global_hq",""), ""))
+    inv["countries_raw"].append(row.get(col.get("countries_of_investment",""), ""))
+    inv["stage_raw"].append(row.get(col.get("stage_of_investment",""), ""))
+    inv["cheque_min"].append(row.get(col.get("first_cheque_minimum",""), ""))
+    inv["cheque_max"].append(row.get(col.get("first_cheque_maximum",""), ""))
+
+_CONFIDENCE = [confidence_flag(*[True] * k, *[False] * (4 - k)) for k in range(5)]   # by #fields present
+
+def finish_investors(inv: dict, issues=None) -> dict:
+    """Bulk step after _parse_row: cheque strings -> units (parse_money_column), then
+    confidence / malus from the number of fields present. Unparseable cheques count as
+    missing: reported here, or added to issues (see merge_issues) when one is given."""
+    n = len(inv["name"])
+    mins, bad_min = parse_money_column(inv["cheque_min"])
+    maxs, bad_max = parse_money_column(inv["cheque_max"])
+    present = ((mins > 0).astype(np.int64) + (maxs > 0)
+               + np.fromiter(map(bool, inv["stage_raw"]), dtype=bool, count=n)
+               + np.fromiter(map(bool, inv["countries_raw"]), dtype=bool, count=n))
+    conf = [_CONFIDENCE[k] for k in present.tolist()]
+    inv["cheque_min"], inv["cheque_max"] = mins.tolist(), maxs.tolist()
+    inv["confidence"], inv["malus"] = conf, [malus_from_confidence(c) for c in conf]
+
+    found = {k: {v: [st, r] for v, (_, st, r) in bad.items()} for k, bad in (("cheque_min", bad_min),
+                                                                             ("cheque_max", bad_max))}
+    if issues is None:
+        report_issues(found)
+    else:
+        merge_issues(issues, found)
+    return inv
+
+def merge_issues(issues: dict, found: dict) -> dict:
+    """Add one chunk's cheque issues ({field: {raw: [status, rows]}}) to issues, in order."""
+    for k, bad in found.items():
+        into = issues.setdefault(k, {})
+        for v, (st, r) in bad.items():
+            into[v] = [st, into[v][1] + r if v in into else r]
+    return issues
+
+def report_issues(issues: dict) -> None:
+    """One [Parse] line per status over every cheque field."""
+    for status in ("partial", "unparseable"):
+        bad = [(v, r) for k in ("cheque_min", "cheque_max") for v, (st, r) in issues.get(k, {}).items()
+               if st == status]
+        if bad:
+            rows = sum(r for _, r in bad)
+            aix_profile.count(f"money_{status}", rows)
+            print(f"[Parse] {rows} cheque cells {status} ({len({v for v, _ in bad})} distinct, e.g. {bad[0][0]!r})"
+                  + (" -> counted as missing" if status == "unparseable" else ""))
+
+def parse_report(path) -> pd.DataFrame:
+    """Every distinct cheque string of the CSV that parse_money could not read cleanly:
+    field, raw, rows, parsed units, status ('partial' / 'unparseable')."""
+    import pandas as pd
+    with open(path, newline="", encoding="utf-8") as f:
+        r = csv.DictReader(f)
+        col = {norm(c): c for c in r.fieldnames or []}
+        fields = {k: col.get(k, "") for k in ("first_cheque_minimum", "first_cheque_maximum")}
+        raw = {k: [] for k in fields}
+        for row in r:
+            for k, c in fields.items():
+                raw[k].append(row.get(c, ""))
+    out = [{"field": k, "raw": v, "rows": n, "parsed": u, "status": st}
+           for k, vals in raw.items() for v, (u, st, n) in parse_money_column(vals)[1].items()]
+    return pd.DataFrame(out, columns=["field","raw","rows","parsed","status"])
+
+def iter_investors(path, types=None, chunk_rows=None, issues=None):
+    """Yield the parsed table in chunks of at most chunk_rows kept rows
+    (a single chunk when chunk_rows is None; always at least one, possibly empty)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        r=csv.DictReader(f)
+        if r.fieldnames is None:
+            raise ValueError(f"{path}: empty CSV (no header row)")
+        col={norm(c):c for c in r.fieldnames}
+        inv, sent = {k: [] for k in INVESTOR_FIELDS}, False
+        rows = aix_profile.timed_iter(r, "csv_decode") if aix_profile.active() else r
+        n_read = n_kept = 0
+        for n_read, row in enumerate(rows, 1):
+            _parse_row(inv, row, col, types)
+            if chunk_rows and len(inv["name"]) >= chunk_rows:
+                n_kept += len(inv["name"])
+                yield finish_investors(inv, issues)
+                inv, sent = {k: [] for k in INVESTOR_FIELDS}, True
+        if types is not None:
+            aix_profile.drop("type", n_read, n_kept + len(inv["name"]))
+        if inv["name"] or not sent:
+            yield finish_investors(inv, issues)
+
+def read_investors(path, types=None, issues=None) -> dict:
+    """Read and parse the OpenVC CSV once -> column lists (country-independent fields only).
+
+    types: keep only these lowercased investor types (None = every row).
+    issues: collect the cheque issues there instead of printing them.
+    """
+    return next(iter_investors(path, types=types, issues=issues))
+
+CODE_FIELDS = ["stage_mask", "type_code"]      # optional row columns, only on cached tables
+VOCAB_FIELDS = ["stage_tokens", "type_names"]  # what their codes index (not row columns)
+
+def encode_investors(inv: dict) -> dict:
+    """Add the country-independent codes kept in the cache: stage_mask (bit i = stage
+    token stage_tokens[i], see aix_countries.stage_masks) and type_code (index in
+    type_names). Stage codes are left out past 62 distinct tokens (int64 masks)."""
+    masks, tokens = stage_masks(inv["stage_raw"])
+    if len(tokens) <= 62:
+        inv["stage_mask"], inv["stage_tokens"] = masks, tokens
+    names = sorted(set(inv["type"]))
+    code = {t: i for i, t in enumerate(names)}
+    inv["type_code"], inv["type_names"] = [code[t] for t in inv["type"]], names
+    return inv
+
+def parse_investors(path) -> tuple:
+    """What the cache stores: (read_investors + encode_investors, {"issues": cheque issues})."""
+    issues = {}
+    return encode_investors(read_investors(path, issues=issues)), {"issues": issues}
+
+def load_investors(path, types=None, cache=True, cache_dir=None) -> dict:
+    """read_investors through the on-disk cache (aix_cache.py), then the type filter.
+    The cheque issues found when the entry was built are reported on every run."""
+    with aix_profile.stage("read_csv") as st:
+        if not cache:
+            inv = read_investors(path, types=types)
+        else:
+            inv, info, hit = cached_table(path, PARSER_VERSION, parse_investors, cache_dir=cache_dir)
+            aix_profile.count("cache_hit" if hit else "cache_miss")
+            report_issues(info.get("issues", {}))
+            if types is not None:
+                ok = [t in types for t in inv["type_names"]]
+                keep = [i for i, c in enumerate(inv["type_code"]) if ok[c]]
+                aix_profile.drop("type", len(inv["type"]), len(keep))
+                inv = {k: v if k in VOCAB_FIELDS else [v[i] for i in keep] for k, v in inv.items()}
+        st["rows_out"] = len(inv["name"])
+    return inv
+
+def select_country(inv: dict, code: str, types=None) -> dict:
+    """Rows of the parsed investor table located in one country, plus their SF / FC."""
+    table = get_country(code)
+    types = types if types is not None else table["types"]
+    keep, fc, typed = [], [], 0
+    with aix_profile.stage(f"locate/{code.upper()}", rows_in=len(inv["type"]), hot=True) as st:
+        if "type_code" in inv:                               # cached codes: one test per type
+            ok = [t in types for t in inv["type_names"]]
+            typed_rows = (ok[c] for c in inv["type_code"])
+        else:
+            typed_rows = (t in types for t in inv["type"])
+        for i, (t_ok, h, c) in enumerate(zip(typed_rows, inv["hq_raw"], inv["countries_raw"])):
+            if not t_ok:
+                continue
+            typed += 1
+            hq_hits, inv_hits = locate(table, h, c)          # one scan per field
+            if "country" in hq_hits or "country" in inv_hits:
+                keep.append(i); fc.append(focus_from_hits(hq_hits, inv_hits))   # 0–15
+
+        base = {k: [inv[k][i] for i in keep] for k in INVESTOR_FIELDS}
+        if "stage_mask" in inv:                              # cached codes: no re-split
+            base["sf"] = score_masks(table, [inv["stage_mask"][i] for i in keep], inv["stage_tokens"])
+        else:
+            base["sf"] = score_stages(table, base["stage_raw"])                          # 0–20
+        base["fc"] = fc
+        base["row"] = keep                                   # index in inv of every kept row
+        st["rows_out"] = len(keep)
+    aix_profile.drop(f"type/{code.upper()}", len(inv["type"]), typed)
+    aix_profile.drop(f"country/{code.upper()}", typed, len(keep))
+    return base
+
+def score_country(inv: dict, code: str, targets=None, types=None) -> pd.DataFrame:
+    """Filter the parsed investor table to one country and score it (full-output frame)."""
+    return score_selected(select_country(inv, code, types), code, targets)
+
+def score_selected(base: dict, code: str, targets=None) -> pd.DataFrame:
+    """Full-output frame of rows already picked by select_country."""
+    return as_frame(score_table(base, code, targets))
+
+def score_table(base: dict, code: str, targets=None) -> dict:
+    """score_selected without pandas: {column: list or array}, in full-output order."""
+    with aix_profile.stage(f"score/{code.upper()}", rows_in=len(base["name"]), hot=True) as st:
+        out = _score_table(base, code, targets)
+        st["rows_out"] = len(base["name"])
+    return out
+
+def as_frame(table: dict) -> pd.DataFrame:
+    import pandas as pd
+    return pd.DataFrame(table)
+
+def _score_table(base: dict, code: str, targets=None) -> dict:
+    table = get_country(code)
+    targets = tuple(targets or table["targets"])
+    sf, fc = base["sf"], base["fc"]
+    m = score_matrix(base["cheque_min"], base["cheque_max"], sf, fc, base["malus"], targets)
+    u = m["unscored"]
+    aix_profile.drop(f"tier_u/{code.upper()}", len(u), int((~u).sum()))
+
+    out = {k: base[k] for k in ["name","website","type","hq_raw","countries_raw","stage_raw"]}
+    for k in ("cheque_min", "cheque_max"):
+        v = np.asarray(base[k], dtype=np.int64)
+        missing = u & (v <= 0)
+        out[k] = as_column(np.where(missing, np.nan, v), missing)
+    out["sf"], out["fc"] = sf, fc
+    out["confidence"], out["malus"] = base["confidence"], base["malus"]
+
+    default_t = table["default_target"]
+    di = targets.index(default_t) if default_t in targets else 0
+    labs = [label_for(t) for t in targets]
+    status = np.where(u, "unscored:no_min_and_max", "scored").astype(object)
+
+    if table["layout"] == "grouped":
+        for i, lab in enumerate(labs):
+            out[f"ac_{lab}"] = as_column(m["ac"][:, i], u)
+            out[f"fs_{lab}"] = as_column(m["fs"][:, i], u)
+        for i, lab in enumerate(labs):
+            out[f"aix_{lab}"] = as_column(m["aix"][:, i], u)
+            out[f"tier_{lab}"] = m["tier"][:, i]
+        out["aix"], out["tier"], out["status"] = as_column(m["aix"][:, di], u), m["tier"][:, di], status
+    else:
+        out["aix"], out["tier"], out["status"] = as_column(m["aix"][:, di], u), m["tier"][:, di], status
+        for i, lab in enumerate(labs):
+            out[f"ac_{lab}"]  = as_column(m["ac"][:, i], u)
+            out[f"fs_{lab}"]  = as_column(m["fs"][:, i], u)
+            out[f"aix_{lab}"] = as_column(m["aix"][:, i], u)
+            out[f"tier_{lab}"]= m["tier"][:, i]
+    return out
+
+def build_scores(path, countries=("FR",), targets=None, cache=True, cache_dir=None, compact=False) -> dict:
+    """One pass over the CSV, scored for every requested country -> {code: DataFrame}.
+
+    compact=True returns the frames in the aix_compact schema (categoricals, small ints).
+    """
+    frames = {c: as_frame(t) for c, t in build_tables(path, countries, targets, cache, cache_dir).items()}
+    if compact:
+        from aix_compact import compact_frame
+        frames = {c: compact_frame(df) for c, df in frames.items()}
+    return frames
+
+def build_tables(path, countries=("FR",), targets=None, cache=True, cache_dir=None) -> dict:
+    """build_scores without pandas -> {code: score_table columns}."""
+    tables = [get_country(c) for c in countries]
+    types = set().union(*(t["types"] for t in tables))
+    inv = load_investors(path, types=types, cache=cache, cache_dir=cache_dir)
+    return {c.upper(): score_table(select_country(inv, c), c, targets) for c in countries}
+
+# ---------- Top-20 simple & summary ----------
+TOP_RENAME = {"name":"fund_name","website":"website","type":"type",
+              "hq_raw":"hq","countries_raw":"countries","stage_raw":"stage",
+              "cheque_min":"min_check","cheque_max":"max_check"}
+
+TOP_COLUMNS = ["scenario","rank_20"] + list(TOP_RENAME.values()) + ["aix"]
+
+def is_nullable(col: str) -> bool:
+    """Full-output columns that turn float (NaN) as soon as one Tier U row exists."""
+    return col in ("cheque_min", "cheque_max", "aix") or col.startswith(("ac_", "fs_", "aix_"))
+
+def column(table, col: str, dtype=None) -> np.ndarray:
+    """One column of a DataFrame or score_table dict as an array (lists of strings -> object)."""
+    v = table[col]
+    if dtype is None and isinstance(v, list):
+        dtype = object if v and isinstance(v[0], str) else None
+    return np.asarray(v, dtype=dtype)
+
+def n_rows(table) -> int:
+    return len(table) if hasattr(table, "columns") else len(next(iter(table.values()), ()))
+
+def n_cols(table) -> int:
+    return len(table.columns) if hasattr(table, "columns") else len(table)
+
+def top_by_tier(df: pd.DataFrame, targets, topn=20, tier="A") -> pd.DataFrame:
+    """Top-N per scenario among funds of one tier ("A", "B", ... or "any" scored tier),
+    ranked by AIx desc, then cheque_max, then SF/FC; all scenarios in one batched
+    partial selection (aix_core.top_n), no per-scenario sort or frame copy."""
+    labs = [label_for(t) for t in targets]
+    return top_frame(df, labs, *top_selection(df, labs, topn, tier))
+
+def top_selection(df: pd.DataFrame, labs, topn=20, tier="A") -> tuple:
+    """(rows, cols, rank) of the Top-N per scenario label, cols indexing labs.
+    df: scored frame or score_table dict."""
+    if not n_rows(df) or not labs:
+        e = np.empty(0, dtype=np.int64)
+        return e, e, e
+    aix = np.column_stack([column(df, f"aix_{lab}", np.float64) for lab in labs])
+    tiers = np.column_stack([column(df, f"tier_{lab}", object) for lab in labs])
+    eligible = (tiers != "U") if tier == "any" else (tiers == tier)
+    keys = rank_keys(aix, column(df, "cheque_max", np.float64), column(df, "sf"), column(df, "fc"), eligible)
+    return top_n(keys, topn)
+
+def top_frame(df: pd.DataFrame, labs, rows, cols, rank) -> pd.DataFrame:
+    """Top-N table from selected (row, scenario column, rank) triples of df."""
+    import pandas as pd
+    return pd.DataFrame(top_table(df, labs, rows, cols, rank), columns=TOP_COLUMNS)
+
+def top_table(df, labs, rows, cols, rank) -> dict:
+    """top_frame without pandas -> {column: array}."""
+    if not len(rows):
+        return {c: np.empty(0, dtype=object) for c in TOP_COLUMNS}
+    out = {"scenario": np.asarray(labs, dtype=object)[cols], "rank_20": np.asarray(rank, dtype=np.int64)}
+    for src, dst in TOP_RENAME.items():
+        out[dst] = column(df, src)[rows]
+    aix = np.column_stack([column(df, f"aix_{lab}") for lab in labs])
+    out["aix"] = aix[rows, cols]
+    return out
+
+def topA_simple(df: pd.DataFrame, targets, topn=20) -> pd.DataFrame:
+    """Top-N A per scenario with only fund info + rank_20 + AIx."""
+    return top_by_tier(df, targets, topn=topn, tier="A")
+
+def tiers_summary_by_scenario(df: pd.DataFrame, targets) -> pd.DataFrame:
+    labs = [label_for(t) for t in targets]
+    return summary_from_counts(labs, tier_counts(df, labs))
+
+def tier_counts(df, labs) -> dict:
+    """{label: {tier: count}} of a scored frame or score_table dict."""
+    counts = {}
+    for lab in labs:
+        tiers, n = np.unique(column(df, f"tier_{lab}", object).astype(str), return_counts=True)
+        counts[lab] = dict(zip(tiers.tolist(), n.tolist()))
+    return counts
+
+def summary_from_counts(labs, counts: dict) -> pd.DataFrame:
+    """A/B/C/U counts and % per scenario from {label: tier -> count}."""
+    import pandas as pd
+    return pd.DataFrame(summary_rows(labs, counts))
+
+def summary_rows(labs, counts: dict) -> list:
+    rows=[]; order=["A","B","C","U"]
+    for lab in labs:
+        vc = counts[lab]; total = int(sum(vc.values()) if isinstance(vc, dict) else vc.sum())
+        for tier in order:
+            cnt = int(vc.get(tier, 0))
+            pct = round((cnt/total*100.0), 1) if total>0 else 0.0
+            rows.append({"scenario":lab, "tier":tier, "count":cnt, "percent":pct})
+    return rows
+
+# ---------- sweep mode ----------
+def sweep_country(inv: dict, code: str, targets, anchor_range=None, types=None) -> tuple:
+    """Long AIx table over a dense target grid + each fund's Tier A interval.
+
+    anchor_range: (lo, hi) keeps only funds Tier A for every target in [lo, hi].
+    """
+    import pandas as pd
+    base = select_country(inv, code, types)
+    long = sweep_long(base, targets)
+    fund = long.pop("fund")
+    sweep = pd.DataFrame({"name": np.asarray(base["name"], dtype=object)[fund],
+                          "website": np.asarray(base["website"], dtype=object)[fund], **long})
+
+    a_from, a_to = tier_a_intervals(base["cheque_min"], base["cheque_max"], base["sf"], base["fc"], base["malus"])
+    idx = anchors_covering(a_from, a_to, *anchor_range) if anchor_range else np.flatnonzero(a_from >= 0)
+    pick = lambda k: [base[k][i] for i in idx]
+    anchors = pd.DataFrame({
+        "name": pick("name"), "website": pick("website"), "type": pick("type"),
+        "cheque_min": pick("cheque_min"), "cheque_max": pick("cheque_max"),
+        "sf": pick("sf"), "fc": pick("fc"), "a_from": a_from[idx], "a_to": a_to[idx],
+    })
+    anchors = anchors.sort_values(["a_from", "a_to"], ascending=[True, False], kind="stable")
+    return sweep, anchors
+
+def output_paths(code: str, out_dir=".") -> tuple:
+    """(full, agg, summary) default file names for a country, e.g. aix_france_v4.csv."""
+    table = get_country(code); d = Path(out_dir)
+    return (d / f"aix_{table['name'].lower()}_v4.csv",
+            d / f"aix_tiers_{table['slug']}_v4.csv",
+            d / f"aix_tiers_{table['slug']}_summary_v4.csv")
+
+def write_csv(table, path) -> None:
+    """DataFrame.to_csv(path, index=False) for a frame or {column: values}, same bytes:
+    float columns as str(float), NaN / None as empty cells. path may be an open text file."""
+    cols = list(table.columns if hasattr(table, "columns") else table)
+    cells = []
+    for c in cols:
+        v = table[c].to_numpy() if hasattr(table, "columns") else column(table, c)
+        if v.dtype.kind in "iuf":
+            out = v.astype(str).astype(object)
+            if v.dtype.kind == "f":
+                out[np.isnan(v)] = ""
+        else:
+            out = np.array(["" if x is None or x != x else x for x in v.tolist()], dtype=object)
+        cells.append(out)
+    with nullcontext(path) if hasattr(path, "write") else open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, lineterminator=os.linesep)
+        w.writerow(cols)
+        w.writerows(zip(*(c.tolist() for c in cells)))
+
+def write_outputs(df: pd.DataFrame, targets, full_out, agg_out, summary_out, topn=20, tier="A"):
+    """Full output, Top-N and summary CSVs of a scored frame or score_table dict."""
+    if hasattr(df, "columns"):
+        from aix_compact import expand_frame, is_compact
+        if is_compact(df):
+            df = expand_frame(df)
+    n = n_rows(df)
+    with aix_profile.stage("write_full", rows_in=n):
+        write_csv(df, full_out)
+
+    labs = [label_for(t) for t in targets]
+    with aix_profile.stage("top_n", rows_in=n) as st:
+        topA = top_table(df, labs, *top_selection(df, labs, topn, tier))
+        write_csv(topA, agg_out)
+        st["rows_out"] = len(topA["scenario"])
+    print(f"[Top-20] wrote {len(topA['scenario'])} rows -> {agg_out}")
+
+    with aix_profile.stage("summary", rows_in=n) as st:
+        rows = summary_rows(labs, tier_counts(df, labs))
+        write_csv({k: [r[k] for r in rows] for k in ("scenario", "tier", "count", "percent")}, summary_out)
+        st["rows_out"] = len(rows)
+    print(f"[Summary] wrote {len(rows)} rows -> {summary_out}")
+
+# ---------- CLI ----------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="AIx multi-country (Top-20 Tier A per scenario + summary, one CSV pass)")
+    p.add_argument("--input", default=DEFAULT_INPUT, help="OpenVC CSV path")
+    p.add_argument("--countries", default="FR,CH", help=f"Comma-separated codes ({','.join(COUNTRIES)})")
+    p.add_argument("--targets", default=None,
+                   help="Target amounts for every country, e.g. '300k,800k,1.5M' (default: per-country)")
+    p.add_argument("--out", default=".", help="Output directory")
+    p.add_argument("--topn", type=int, default=20, help="Top-N size")
+    p.add_argument("--top-tier", default="A", choices=["A","B","C","any"],
+                   help="Tier ranked in the Top-N table ('any' = every scored fund)")
+    p.add_argument("--sweep", default=None,
+                   help="Dense sweep START:STOP:STEP, e.g. '100k:5M:25k' (long AIx table + Tier A intervals)")
+    p.add_argument("--anchor-range", default=None,
+                   help="With --sweep: only funds Tier A across LO:HI, e.g. '400k:2M'")
+    p.add_argument("--grid", default=None,
+                   help="Sensitivity grid over the formula's knobs, e.g. 'ac_max=25:35:5;cut_a=70,75,80' "
+                        "(tier shifts + Top-N Kendall tau vs the published parameters)")
+    p.add_argument("--grid-rescale", action="store_true",
+                   help="With --grid: rescale each combination's raw maximum to 100 instead of the published /90")
+    p.add_argument("--batch", default=None,
+                   help="JSONL of founder requests (country, target, stage ...): one scoring pass per "
+                        "(dataset, country), per-request Top-N + summary under <out>/<id>/ (see aix_batch.py)")
+    p.add_argument("--batch-jobs", type=int, default=8, help="Concurrent request reports with --batch")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Score byte-range shards of the CSV on N processes (no parse cache)")
+    p.add_argument("--stream", action="store_true",
+                   help="Chunked low-memory build (same outputs, no parse cache)")
+    p.add_argument("--chunk-rows", type=int, default=50_000, help="Rows per chunk with --stream")
+    p.add_argument("--incremental", action="store_true",
+                   help="Re-score only rows changed since the last --incremental run (writes a change log)")
+    p.add_argument("--state-dir", default=None, help="State of --incremental runs (default: <out>/.aix_state)")
+    p.add_argument("--merge-input", default=None,
+                   help="More exports to read after --input (comma-separated CSV paths)")
+    p.add_argument("--dedup", action="store_true",
+                   help="Merge duplicate funds (website domain / fuzzy name) before scoring; writes aix_dedup_v4.csv")
+    p.add_argument("--cache-dir", default=None, help="Parsed-CSV cache directory (default: <input dir>/.aix_cache)")
+    p.add_argument("--no-cache", action="store_true", help="Always re-parse the CSV")
+    p.add_argument("--parse-report", default=None,
+                   help="Write the cheque strings that did not parse cleanly (CSV) and continue")
+    p.add_argument("--snapshot", action="store_true",
+                   help="Also write each scored frame as a memory-mappable .aixsnap directory (see aix_snapshot.py)")
+    p.add_argument("--transitions", action="store_true",
+                   help="Also write each country's per-fund tier transition index (.aixtrans.npz): counts / Top-N "
+                        "at any round size without re-scoring (see aix_transitions.py)")
+    p.add_argument("--memory-report", default=None,
+                   help="Write per-column memory use of the scored frames, object vs compact schema (CSV)")
+    p.add_argument("--profile", default=None,
+                   help=f"Write a per-stage JSON timing report here ('-' = stderr; also ${aix_profile.PROFILE_ENV})")
+    p.add_argument("--profile-cprofile", default=None, help="With profiling on: cProfile the scoring stages to this .pstats file")
+    args = p.parse_args(argv)
+    aix_profile.start(args.profile, args.profile_cprofile)
+    try:
+        _run(p, args)
+    finally:
+        aix_profile.finish()
+
+def _run(p, args):
+    try:                                                     # bad specs -> usage error, not a traceback
+        codes = parse_countries(args.countries)
+        sweep_grid = parse_sweep(args.sweep) if args.sweep else None
+        if args.grid:
+            from aix_sensitivity import parse_grid
+            param_grid = parse_grid(args.grid)
+    except ValueError as e:
+        p.error(str(e))
+    targets = parse_targets(args.targets) if args.targets else None
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+    if args.parse_report:
+        bad = parse_report(args.input)
+        bad.to_csv(args.parse_report, index=False)
+        print(f"[Parse] wrote {len(bad)} unclean cheque values ({int(bad['rows'].sum())} cells) -> {args.parse_report}")
+
+    if args.batch:
+        from aix_batch import batch_build
+        batch_build(args.batch, args.out, args.input, topn=args.topn, tier=args.top_tier, jobs=args.batch_jobs,
+                    cache=not args.no_cache, cache_dir=args.cache_dir)
+        return
+
+    if args.sweep:
+        grid = sweep_grid
+        rng = None
+        if args.anchor_range:
+            rng = parse_targets(args.anchor_range.replace(":", ","), default=())
+            if len(rng) != 2:
+                p.error(f"--anchor-range must be LO:HI, got '{args.anchor_range}'")
+        inv = _investors(args, codes)
+        for code in codes:
+            table = get_country(code)
+            sweep, anchors = sweep_country(inv, code, grid, anchor_range=rng)
+            sweep_out = Path(args.out) / f"aix_{table['name'].lower()}_sweep_v4.csv"
+            anchor_out = Path(args.out) / f"aix_tiers_{table['slug']}_anchor_v4.csv"
+            sweep.to_csv(sweep_out, index=False)
+            anchors.to_csv(anchor_out, index=False)
+            print(f"[Sweep] wrote {len(sweep)} rows ({len(grid)} targets) -> {sweep_out}")
+            print(f"[Anchor] wrote {len(anchors)} Tier A intervals -> {anchor_out}")
+        return
+
+    if args.grid:
+        from aix_sensitivity import sensitivity
+        grid = param_grid
+        inv = _investors(args, codes)
+        for code in codes:
+            table = get_country(code)
+            t = targets or table["targets"]
+            rep = sensitivity(select_country(inv, code), t, grid, topn=args.topn, tier=args.top_tier,
+                              labels=[label_for(x) for x in t], rescale=args.grid_rescale)
+            out = Path(args.out) / f"aix_sensitivity_{table['slug']}_v4.csv"
+            rep.to_csv(out, index=False)
+            print(f"[Sensitivity] wrote {len(grid)} combinations x {len(t)} scenarios -> {out}")
+        return
+
+    if (args.dedup or args.merge_input) and (args.stream or args.incremental or args.workers > 1):
+        p.error("--dedup / --merge-input work on the in-memory build only (not --stream, --incremental, --workers)")
+
+    if args.stream:
+        from aix_stream import stream_build
+        stream_build(args.input, {c: output_paths(c, args.out) for c in codes},
+                     targets=targets, topn=args.topn, chunk_rows=args.chunk_rows, tier=args.top_tier)
+        return
+
+    if args.incremental:
+        from aix_incremental import incremental_build
+        incremental_build(args.input, countries=codes, targets=targets, out_dir=args.out,
+                          state_dir=args.state_dir, topn=args.topn, tier=args.top_tier)
+        return
+
+    if args.workers > 1:
+        from aix_shard import build_scores_parallel
+        frames = build_scores_parallel(args.input, countries=codes, targets=targets, workers=args.workers)
+    else:                                                    # pandas-free path
+        inv = _investors(args, codes)
+        frames = {c.upper(): score_table(select_country(inv, c), c, targets) for c in codes}
+        if args.memory_report:
+            frames = {c: as_frame(t) for c, t in frames.items()}
+    for code, df in frames.items():
+        t = targets or get_country(code)["targets"]
+        paths = output_paths(code, args.out)
+        write_outputs(df, t, *paths, topn=args.topn, tier=args.top_tier)
+        if args.snapshot:
+            from aix_snapshot import write_snapshot, snapshot_path
+            with aix_profile.stage("snapshot", rows_in=n_rows(df)):
+                snap = write_snapshot(as_frame(df), snapshot_path(paths[0]), code)
+            print(f"[Snapshot] wrote {n_rows(df)} rows x {n_cols(df)} columns -> {snap}")
+        if args.transitions:
+            from aix_transitions import TransitionIndex, transitions_path
+            with aix_profile.stage("transitions", rows_in=n_rows(df)) as st:
+                idx = TransitionIndex.from_table(df, code)
+                out = idx.save(transitions_path(paths[0]))
+                st["rows_out"] = len(idx.start)
+            print(f"[Transitions] wrote {len(idx.start)} steps for {len(idx)} funds -> {out}")
+    if args.memory_report:
+        from aix_compact import memory_report
+        rep = memory_report(frames)
+        rep.to_csv(args.memory_report, index=False)
+        for r in rep[rep["column"] == "TOTAL"].itertuples():
+            print(f"[Memory] {r.country}: {r.bytes_before/2**20:.2f} MB -> {r.bytes_after/2**20:.2f} MB compact (x{r.ratio})")
+
+def _investors(args, codes) -> dict:
+    """Parsed investors of the types the countries need: --input alone, or merged with
+    --merge-input and / or deduplicated (--dedup)."""
+    types = set().union(*(get_country(c)["types"] for c in codes))
+    cache = dict(cache=not args.no_cache, cache_dir=args.cache_dir)
+    if not (args.dedup or args.merge_input):
+        return load_investors(args.input, types=types, **cache)
+    from aix_dedup import merge_investors, dedup_investors, DEDUP_COLUMNS
+    paths = [args.input] + [x.strip() for x in (args.merge_input or "").split(",") if x.strip()]
+    inv = merge_investors(paths, types, **cache)
+    if args.dedup:
+        n = len(inv["name"])
+        with aix_profile.stage("dedup", rows_in=n) as st:
+            inv, report = dedup_investors(inv)
+            st["rows_out"] = len(inv["name"])
+        out = Path(args.out) / "aix_dedup_v4.csv"
+        write_csv({k: [r[k] for r in report] for k in DEDUP_COLUMNS}, out)
+        print(f"[Dedup] {n} rows from {len(paths)} export(s) -> {len(inv['name'])} funds "
+              f"({sum(c > 1 for c in inv['dup_count'])} merged clusters) -> {out}")
+    return inv
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# AIx — on-disk cache of the parsed investor table (aix_builder.parse_investors output)
+# One .npz per (CSV path, CSV content hash, parser version): ints as int64 arrays,
+# strings dictionary-encoded (int32 codes + utf-8 heap + offsets), plus a JSON info
+# record (e.g. the cheque issues found by the parse). No pickle involved.
+# A new OpenVC export or a PARSER_VERSION bump changes the key -> automatic miss; a
+# miss only evicts the older entries of the same resolved CSV path.
+
+import hashlib, json, os
+from pathlib import Path
+
+import numpy as np
+
+CACHE_ENV = "AIX_CACHE_DIR"            # overrides the default <csv dir>/.aix_cache
+FORMAT = 2                             # entry layout (2: info record, path-tagged names)
+
+# ---------- key ----------
+def file_digest(path, chunk=1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def source_tag(csv_path) -> str:
+    """8 hex chars of the resolved CSV path: entries of same-named exports in different
+    folders sharing a cache directory never evict each other."""
+    return hashlib.sha256(str(Path(csv_path).resolve()).encode("utf-8")).hexdigest()[:8]
+
+def cache_path(csv_path, version, cache_dir=None, digest=None) -> Path:
+    """<cache_dir>/<csv stem>-<path tag>-<sha256[:16]>-p<version>.npz"""
+    csv_path = Path(csv_path)
+    d = Path(cache_dir or os.environ.get(CACHE_ENV) or csv_path.parent / ".aix_cache")
+    digest = digest or file_digest(csv_path)
+    return d / f"{csv_path.stem}-{source_tag(csv_path)}-{digest[:16]}-p{version}.npz"
+
+# ---------- columnar encoding ----------
+def _encode_strings(values):
+    uniq, codes = {}, np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        codes[i] = uniq.setdefault("" if v is None else v, len(uniq))
+    blobs = [u.encode("utf-8") for u in uniq]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in blobs])
+    return codes, np.frombuffer(b"".join(blobs), dtype=np.uint8), offsets
+
+def _decode_strings(codes, heap, offsets):
+    raw = heap.tobytes()
+    uniq = [raw[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    return [uniq[c] for c in codes.tolist()]
+
+def _kind(v) -> str:
+    if isinstance(v, np.ndarray) and v.dtype != object:
+        return "f" if v.dtype.kind == "f" else "i"
+    return "s" if not len(v) or isinstance(v[0], str) else "i"
+
+def save_table(path, table: dict, meta: dict) -> None:
+    """Write a {column: list[str|int] or array} table atomically (tmp file + rename).
+    Float arrays are kept as float64 (NaN included); object arrays are strings."""
+    arrays = {}
+    for k, v in table.items():
+        kind = _kind(v)
+        if kind == "s":
+            codes, heap, offsets = _encode_strings(v)
+            arrays[f"s:{k}:codes"], arrays[f"s:{k}:heap"], arrays[f"s:{k}:offsets"] = codes, heap, offsets
+        else:
+            arrays[f"{kind}:{k}"] = np.asarray(v, dtype=np.float64 if kind == "f" else np.int64)
+    for k, v in meta.items():
+        arrays[f"m:{k}"] = np.asarray(str(v))
+    path = Path(path); path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+def load_table(path, arrays=False) -> tuple:
+    """-> (table, meta) as written by save_table; columns come back as lists, or as
+    NumPy arrays (object arrays for strings) with arrays=True."""
+    table, meta = {}, {}
+    with np.load(path, allow_pickle=False) as z:
+        for name in z.files:
+            kind, key = name.split(":", 1)
+            if kind in ("i", "f"):
+                table[key] = z[name] if arrays else z[name].tolist()
+            elif kind == "m":
+                meta[key] = str(z[name])
+            elif key.endswith(":codes"):
+                col = key[:-len(":codes")]
+                table[col] = _decode_strings(z[name], z[f"s:{col}:heap"], z[f"s:{col}:offsets"])
+                if arrays:
+                    table[col] = np.array(table[col], dtype=object)
+    return table, meta
+
+# ---------- cache ----------
+def cached_table(csv_path, version, build, cache_dir=None) -> tuple:
+    """Return (table, info, hit). build(csv_path) -> (table, info dict, JSON-able). On a
+    miss the entry is stored and stale entries of the same CSV path are removed."""
+    digest = file_digest(csv_path)
+    path = cache_path(csv_path, version, cache_dir, digest)
+    if path.exists():
+        try:
+            table, meta = load_table(path)
+            if (meta.get("digest") == digest and meta.get("version") == str(version)
+                    and meta.get("format") == str(FORMAT)):
+                return table, json.loads(meta["info"]), True
+        except (OSError, ValueError, KeyError):
+            pass                                   # unreadable entry -> rebuild
+    table, info = build(csv_path)
+    try:
+        for old in path.parent.glob(f"{Path(csv_path).stem}-{source_tag(csv_path)}-{'?' * 16}-p*.npz"):
+            old.unlink()
+        save_table(path, table, {"digest": digest, "version": version, "format": FORMAT,
+                                 "source": str(Path(csv_path).resolve()), "info": json.dumps(info)})
+    except OSError:
+        pass                                       # read-only location: run uncached
+    return table, info, False
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# AIx — compact typed schema for scored frames + memory-footprint report
+# score_country() frames keep the CSV-facing dtypes (object strings, int64 or float64
+# with NaN on Tier U rows). compact_frame() stores the same values with categoricals
+# for the repeated strings (type, confidence, status, tiers, HQ / countries / stage
+# text), nullable fixed-width ints for cheques and sub-scores, int8 for SF / FC / malus.
+# expand_frame() is its exact inverse: the expanded frame writes the same CSV bytes.
+
+import numpy as np
+import pandas as pd
+
+TIER_DTYPE = pd.CategoricalDtype(["A", "B", "C", "U"])
+CONFIDENCE_DTYPE = pd.CategoricalDtype(["high", "mid", "low"])
+STATUS_DTYPE = pd.CategoricalDtype(["scored", "unscored:no_min_and_max"])
+
+_TEXT = ("type", "hq_raw", "countries_raw", "stage_raw")     # few distinct values, many rows
+_SMALL = ("sf", "fc", "malus")
+
+def _kind(col: str):
+    """Compact dtype of one full-output column (None = leave as is)."""
+    if col == "tier" or col.startswith("tier_"):
+        return TIER_DTYPE
+    if col == "confidence":
+        return CONFIDENCE_DTYPE
+    if col == "status":
+        return STATUS_DTYPE
+    if col in _TEXT:
+        return "category"
+    if col in ("cheque_min", "cheque_max"):
+        return "Int64"
+    if col == "aix" or col.startswith(("ac_", "fs_", "aix_")):
+        return "Int8"                                   # 0–100
+    if col in _SMALL:
+        return "int8"
+    return None
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Same table in the compact schema (values unchanged)."""
+    out = {}
+    for col in df.columns:
+        kind, s = _kind(col), df[col]
+        if kind is None:
+            out[col] = s
+        elif kind in ("Int64", "Int8"):
+            v = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            if kind == "Int64" and not (np.abs(v) >= 2**31).any():
+                kind = "Int32"                          # cheques below 2.1bn
+            out[col] = pd.array(v, dtype=kind)
+        else:
+            out[col] = s.astype(kind)
+    return pd.DataFrame(out, index=df.index)
+
+def expand_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Back to the CSV-facing dtypes: nullable ints -> int64, or float64 with NaN when
+    any value is missing; categoricals -> plain strings; int8 -> int64."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = s.astype(s.cat.categories.dtype)
+        elif _nullable_int(s.dtype):
+            out[col] = s.to_numpy(dtype=np.float64, na_value=np.nan) if s.isna().any() else s.to_numpy(dtype=np.int64)
+        elif col in _SMALL:
+            out[col] = s.to_numpy(dtype=np.int64)
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+def _nullable_int(dtype) -> bool:
+    return pd.api.types.is_extension_array_dtype(dtype) and dtype.kind in "iu"
+
+def is_compact(df: pd.DataFrame) -> bool:
+    return any(isinstance(t, pd.CategoricalDtype) or _nullable_int(t) for t in df.dtypes)
+
+# ---------- footprint ----------
+def memory_report(frames: dict) -> pd.DataFrame:
+    """Per country and column: dtype and deep bytes before / after compact_frame.
+    frames: {code: frame in either schema}; one TOTAL row per country."""
+    rows = []
+    for code, df in frames.items():
+        wide = expand_frame(df) if is_compact(df) else df
+        small = df if is_compact(df) else compact_frame(df)
+        before, after = wide.memory_usage(deep=True, index=False), small.memory_usage(deep=True, index=False)
+        for col in wide.columns:
+            rows.append({"country": code, "column": col, "dtype_before": str(wide[col].dtype),
+                         "bytes_before": int(before[col]), "dtype_after": str(small[col].dtype),
+                         "bytes_after": int(after[col])})
+        rows.append({"country": code, "column": "TOTAL", "dtype_before": "", "bytes_before": int(before.sum()),
+                     "dtype_after": "", "bytes_after": int(after.sum())})
+    rep = pd.DataFrame(rows, columns=["country","column","dtype_before","bytes_before","dtype_after","bytes_after"])
+    rep["ratio"] = (rep["bytes_before"] / rep["bytes_after"].where(rep["bytes_after"] > 0)).round(2)
+    return rep
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# AIx — shared columnar scoring engine (NumPy)
+# Used by aix_builder_fr.py / aix_builder_sw.py: the builders collect one array per
+# field (cheque min/max, SF, FC, malus) and score the whole investor × target grid here.
+
+import numpy as np
+
+TIER_LABELS = np.array(["A", "B", "C", "U"], dtype=object)   # tier codes 0..3
+
+# ---------- vectorised scoring ----------
+def units(values) -> np.ndarray:
+    """int64 column; None / NaN (missing cheque, e.g. a frame column with Tier U rows) -> 0."""
+    v = np.asarray(values)
+    if v.dtype.kind in "fO":
+        v = np.nan_to_num(np.asarray(v, dtype=np.float64), nan=0.0)
+    return v.astype(np.int64)
+
+def score_grid(min_c, max_c, sf, fc, malus, t, ac_max=30, ac_cap=15, band_lo=0.6, band_hi=1.1,
+               norm=90, cut_a=75, cut_b=55, capped=None) -> dict:
+    """Elementwise AC/FS/AIx/tier codes for broadcastable arrays (investor fields and
+    targets in any shape). Tier U entries carry NaN for ac/fs/aix and code 3.
+
+    The keywords are the formula's knobs (defaults = the published AIx): they broadcast
+    too, so a whole parameter grid is one call (aix_sensitivity.py). capped marks funds
+    whose AC is capped at ac_cap (default SF < 20); norm is the raw maximum rescaled to 100.
+    """
+    capped = (sf < 20) if capped is None else capped
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # AC (0–30), cap 15 if SF<20
+        ratio = max_c / t
+        ac = np.where(ratio >= 1, 1.0 * ac_max, np.rint(ratio * ac_max))
+        ac = np.where(max_c > 0, ac, 0.0)
+        ac = np.where(capped, np.minimum(ac, 1.0 * ac_cap), ac)
+
+        # FS (0–25), overlap with [0.6×target ; 1.1×target]
+        lower, upper = band_lo * t, band_hi * t
+        overlap = np.maximum(0.0, np.minimum(max_c, upper) - np.maximum(min_c, lower))
+        band = upper - lower
+        fs = np.where(band > 0, np.rint(25 * (overlap / band)), 0.0)
+        fs = np.where((min_c > 0) & (max_c > 0) & (max_c >= min_c), fs, 0.0)
+
+    raw90 = ac + fs + sf + fc
+    raw100 = np.rint(raw90 * (100.0 / norm))
+    aix = np.clip(raw100 + malus, 0, 100)
+
+    codes = np.where(aix >= cut_a, 0, np.where(aix >= cut_b, 1, 2))
+    unscored = np.broadcast_to((min_c <= 0) & (max_c <= 0), aix.shape)
+    codes = np.where(unscored, 3, codes)
+    ac, fs, aix = (np.where(unscored, np.nan, a) for a in (ac, fs, aix))
+    return {"ac": ac, "fs": fs, "aix": aix, "codes": codes, "unscored": unscored}
+
+def score_matrix(min_c, max_c, sf, fc, malus, targets) -> dict:
+    """AC/FS/AIx/tier for every (investor, target) pair in one pass.
+
+    Same arithmetic (and banker's rounding) as the scalar score_anchor_capacity /
+    score_flex / assign_tier helpers. Returns (n, k) arrays; Tier U rows carry NaN
+    for ac/fs/aix and "U" for tier. Missing cheques may be 0, None or NaN.
+    """
+    col = lambda v: units(v)[:, None]
+    min_c, max_c = col(min_c), col(max_c)
+    t = np.asarray(targets, dtype=np.float64)[None, :]
+    g = score_grid(min_c, max_c, col(sf), col(fc), col(malus), t)
+    return {"ac": g["ac"], "fs": g["fs"], "aix": g["aix"], "tier": TIER_LABELS[g["codes"]],
+            "unscored": ((min_c <= 0) & (max_c <= 0))[:, 0]}
+
+def as_column(values, unscored):
+    """Float column with NaN on Tier U rows, plain int64 when every row is scored
+    (same dtype pandas infers from the old list-of-dicts rows)."""
+    values = np.asarray(values)
+    if unscored.any():
+        return values.astype(np.float64)
+    return values.astype(np.int64)
+
+# ---------- Top-N ----------
+def dense_rank(values) -> tuple:
+    """Ascending dense ranks 0..R-1 of a 1-D array -> (ranks, R)."""
+    uniq, inv = np.unique(np.asarray(values), return_inverse=True)
+    return inv.reshape(-1), len(uniq)
+
+def top_n(keys, topn: int) -> tuple:
+    """Top-N rows of every column of an (n, k) int64 key matrix, largest key first and
+    lowest row first on ties (a stable descending sort). Negative keys are ineligible.
+
+    Partial selection: one np.partition per column finds the N-th key; only rows at or
+    above it are ordered. Returns (rows, cols, rank) sorted by column then rank (1-based).
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    n = keys.shape[0]
+    if n == 0 or topn <= 0:
+        e = np.empty(0, dtype=np.int64)
+        return e, e, e
+    m = min(topn, n)
+    kth = np.partition(keys, n - m, axis=0)[n - m]
+    rows, cols = np.nonzero((keys >= kth) & (keys >= 0))
+    kv = keys[rows, cols]
+    order = np.lexsort((rows, -kv, cols))
+    rows, cols = rows[order], cols[order]
+    rank = np.arange(len(cols)) - np.searchsorted(cols, cols, side="left")
+    keep = rank < topn
+    return rows[keep], cols[keep], rank[keep] + 1
+
+def rank_keys(aix, cheque_max, sf, fc, eligible) -> np.ndarray:
+    """Composite int64 key ordering (AIx, cheque_max, SF, FC) descending, -1 where not eligible.
+
+    aix/eligible are (n, k); cheque_max/sf/fc are per-fund and enter as dense ranks so
+    the key fits 64 bits whatever the cheque amounts.
+    """
+    cm = np.asarray(cheque_max, dtype=np.float64)
+    rc, nc = dense_rank(np.where(np.isnan(cm), -1.0, cm))
+    rs, ns = dense_rank(sf)
+    rf, nf = dense_rank(fc)
+    fund = (rc * ns + rs) * nf + rf
+    width = nc * ns * nf
+    aix = np.nan_to_num(np.asarray(aix, dtype=np.float64), nan=0.0).astype(np.int64)
+    return np.where(eligible, aix * width + fund[:, None], -1)
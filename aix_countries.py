@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# AIx — country tables (aliases / regions / stage keywords) used by aix_builder.py
+# Adding a country = adding one entry to COUNTRIES (or calling register_country).
+#
+#   aliases   -> words that place a fund in the country (HQ -> FC 15, invest -> FC 10)
+#   regions   -> invest-region words worth an invest match (FC 10), e.g. "dach"
+#   europe    -> wider words worth FC 5
+#   (aliases / regions / europe are matched as whole tokens, case-insensitive, by one
+#    compiled regex per country: "eu" no longer hits "neutral", "nice" no longer hits "venice")
+#   preseed   -> stage keywords worth SF 20 ; seed -> SF 8
+#   types     -> investor types kept (lowercased "Investor type")
+#   targets   -> default scenarios ; default_target -> scenario copied into aix/tier
+#   layout    -> full-output column order: "per_scenario" (ac/fs/aix/tier per target)
+#                or "grouped" (all ac/fs, then all aix/tier, then aix/tier/status)
+
+import re
+
+PRESEED_KEYS = ["prototype","early revenue","pre-seed","pre seed","preseed","idea","idéation"]
+SEED_KEYS    = ["seed"]
+EUROPE_KEYS  = ["europe","european","eu"]
+
+COUNTRIES = {
+    "FR": {
+        "name": "France", "slug": "fr",
+        "aliases": ["france","paris","ile-de-france","île-de-france","idf","lyon","marseille",
+                    "toulouse","lille","nantes","bordeaux","rennes","strasbourg","grenoble",
+                    "nice","sophia antipolis","sophia-antipolis"],
+        "regions": [], "europe": EUROPE_KEYS,
+        "preseed": PRESEED_KEYS + ["pré-amorçage","pre-amorcage","pre-amorçage","pre amorcage",
+                                   "pre amorçage","ideation"],
+        "seed": SEED_KEYS + ["amorçage","amorcage"],
+        "types": ["vc","corporate vc","cvc"],
+        "targets": (250_000, 700_000, 1_200_000), "default_target": 700_000,
+        "layout": "per_scenario",
+    },
+    "CH": {
+        "name": "Switzerland", "slug": "sw",
+        "aliases": ["switzerland","suisse","schweiz","confederation suisse","lausanne","geneva",
+                    "genève","zurich","zug","vaud","bern","berne","basel"],
+        "regions": ["dach"], "europe": EUROPE_KEYS,
+        "preseed": PRESEED_KEYS + ["patent"], "seed": SEED_KEYS,
+        "types": ["vc","corporate vc"],
+        "targets": (300_000, 800_000, 1_500_000), "default_target": 800_000,
+        "layout": "grouped",
+    },
+    "DE": {
+        "name": "Germany", "slug": "de",
+        "aliases": ["germany","deutschland","berlin","munich","münchen","muenchen","hamburg",
+                    "frankfurt","cologne","köln","koeln","düsseldorf","dusseldorf","stuttgart",
+                    "leipzig","dresden","karlsruhe"],
+        "regions": ["dach"], "europe": EUROPE_KEYS,
+        "preseed": PRESEED_KEYS, "seed": SEED_KEYS,
+        "types": ["vc","corporate vc","cvc"],
+        "targets": (300_000, 800_000, 1_500_000), "default_target": 800_000,
+        "layout": "per_scenario",
+    },
+    "NORDICS": {
+        "name": "Nordics", "slug": "nordics",
+        "aliases": ["sweden","stockholm","gothenburg","malmö","malmo","norway","oslo","bergen",
+                    "denmark","copenhagen","aarhus","finland","helsinki","espoo","iceland",
+                    "reykjavik","nordic","scandinavia"],
+        "regions": [], "europe": EUROPE_KEYS,
+        "preseed": PRESEED_KEYS, "seed": SEED_KEYS,
+        "types": ["vc","corporate vc","cvc"],
+        "targets": (300_000, 800_000, 1_500_000), "default_target": 800_000,
+        "layout": "per_scenario",
+    },
+}
+
+def register_country(code: str, table: dict) -> None:
+    """Add (or replace) a country table; missing keys fall back to the generic defaults."""
+    full = {"regions": [], "europe": EUROPE_KEYS, "preseed": PRESEED_KEYS,
+            "seed": SEED_KEYS, "types": ["vc","corporate vc","cvc"],
+            "targets": (300_000, 800_000, 1_500_000), "default_target": 800_000,
+            "layout": "per_scenario", "slug": code.lower()}
+    full.update(table)
+    COUNTRIES[code.upper()] = full
+
+def get_country(code: str) -> dict:
+    try:
+        return COUNTRIES[code.strip().upper()]
+    except KeyError:
+        raise ValueError(f"unknown country '{code}' (known: {', '.join(COUNTRIES)})") from None
+
+def parse_countries(txt: str):
+    """'FR,CH' -> ['FR', 'CH'] (validated against the registry)."""
+    codes = [c.strip().upper() for c in str(txt).split(",") if c.strip()]
+    for c in codes:
+        get_country(c)
+    return codes
+
+# ---------- matching ----------
+_GROUPS = (("country", "aliases"), ("region", "regions"), ("europe", "europe"))
+
+def compile_matcher(table: dict):
+    """One alternation regex over every alias/region/europe word of a country, with
+    token boundaries; longest words first so 'sophia antipolis' wins over shorter hits."""
+    parts = []
+    for group, key in _GROUPS:
+        words = sorted(set(table.get(key, [])), key=len, reverse=True)
+        if words:
+            parts.append(f"(?P<{group}>{'|'.join(re.escape(w) for w in words)})")
+    return re.compile(r"(?<!\w)(?:" + "|".join(parts) + r")(?!\w)", re.IGNORECASE)
+
+def matcher(table: dict):
+    """Compiled matcher of a table (built once, kept on the table)."""
+    rx = table.get("_rx")
+    if rx is None:
+        rx = table["_rx"] = compile_matcher(table)
+    return rx
+
+def scan(table: dict, text) -> frozenset:
+    """Single scan of one field -> matched groups among {'country', 'region', 'europe'}."""
+    if not text: return frozenset()
+    return frozenset(m.lastgroup for m in matcher(table).finditer(str(text)))
+
+def locate(table: dict, hq, countries) -> tuple:
+    """(hq hits, invest hits) — shared by the country filter and the FC score."""
+    return scan(table, hq), scan(table, countries)
+
+def focus_from_hits(hq_hits, inv_hits) -> int:
+    """FC (0–15): HQ in country 15, invest in country / region 10, Europe 5."""
+    if "country" in hq_hits: return 15
+    if "country" in inv_hits or "region" in inv_hits: return 10
+    if "europe" in inv_hits: return 5
+    return 0
+
+def contains(table: dict, text) -> bool:
+    return "country" in scan(table, text)
+
+def score_focus(table: dict, countries, hq) -> int:
+    """FC (0–15) from the raw fields (see focus_from_hits)."""
+    return focus_from_hits(*locate(table, hq, countries))
+
+def score_stage(table: dict, stage) -> int:
+    """SF (0–20): explicit pre-seed/early 20, seed 8."""
+    s = (stage or "").lower()
+    if any(k in s for k in table["preseed"]): return 20
+    if any(k in s for k in table["seed"]): return 8
+    return 0
+
+# ---------- stage bitmask ----------
+def stage_masks(values) -> tuple:
+    """Comma-separated stage lists -> (masks, tokens): bit i of a row's mask is set when
+    tokens[i] (lowercased, stripped) is in its list. Each distinct string is split once."""
+    tokens, bit, seen, masks = [], {}, {}, []
+    for v in values:
+        m = seen.get(v)
+        if m is None:
+            m = 0
+            for t in (v or "").lower().split(","):
+                t = t.strip()
+                if t:
+                    if t not in bit:
+                        bit[t] = len(tokens); tokens.append(t)
+                    m |= 1 << bit[t]
+            seen[v] = m
+        masks.append(m)
+    return masks, tokens
+
+def score_stages(table: dict, values) -> list:
+    """score_stage of every value as a lookup: SF of each distinct token once, then the
+    best token of each distinct mask (keywords never span a comma, so this is exact)."""
+    return score_masks(table, *stage_masks(values))
+
+def score_masks(table: dict, masks, tokens) -> list:
+    """score_stages from stage_masks output (e.g. the codes kept in aix_cache)."""
+    level = [score_stage(table, t) for t in tokens]
+    sf = {}
+    for m in masks:
+        if m not in sf:
+            sf[m] = max((level[i] for i in range(m.bit_length()) if m >> i & 1), default=0)
+    return [sf[m] for m in masks]
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# AIx — blocked fuzzy deduplication of investors across one or more exports (--dedup)
+# Candidate pairs only come from blocks, never from all pairs:
+#   domain  normalised website host (no scheme / www / path; shared hosts such as
+#           linkedin.com or angel.co ignored)
+#   name    MinHash of the name's character 3-grams (accents, punctuation and legal
+#           forms stripped), LSH_BANDS bands of LSH_ROWS hashes -> one bucket per band
+# Inside a block, records are sorted by name and only those less than WINDOW apart
+# are paired (every pair of a small block), so candidates grow linearly with the rows;
+# each block's candidates are checked as soon as they are built.
+# A pair is merged when the MinHash estimate of the names' Jaccard reaches NAME_SIM
+# (no conflicting domains), or SAME_DOMAIN_SIM when they share a domain and one name's
+# words contain the other's ("OUP Osage University Partners"), and both names carry the
+# same numbers / roman numerals and fund qualifiers ("Fund II" is not "Fund III",
+# "Digital East Fund" is not "Digital West Fund"). Never merged: records
+# whose valid cheque ranges do not overlap, and differently named records on distinct
+# pages of one site (sapphireventures.com/funds/sapphire-sport/). Clusters grow from
+# the merged pairs, most similar first, and two clusters only join when those rules
+# (and one domain per cluster) hold for every pair of members across them, so A-B and
+# B-C never pull together an A and C that conflict.
+# Merge rule, fixed order = most fields present, then input order: text fields come
+# from the first record that has them; the cheque range is the first valid range
+# (min and max > 0, max >= min), else each bound from the first record that has one.
+# Confidence / malus are recomputed on the merged record; "source" keeps every
+# member as <file>#<record>.
+
+import re, unicodedata
+from pathlib import Path
+
+import numpy as np
+
+from aix_builder import INVESTOR_FIELDS, load_investors, confidence_flag, malus_from_confidence
+
+SHARED_HOSTS = {"linkedin.com", "openvc.app", "angel.co", "wellfound.com", "crunchbase.com", "twitter.com",
+                "x.com", "facebook.com", "medium.com", "notion.site", "google.com", "sites.google.com"}
+LEGAL_FORMS = {"sa", "ag", "gmbh", "ltd", "llc", "llp", "lp", "inc", "sas", "sarl", "bv", "nv", "ab", "as",
+               "aps", "oy", "plc", "spa", "srl", "the"}
+QUALIFIERS = {"east", "west", "north", "south", "central", "europe", "european", "asia", "africa", "america",
+              "americas", "nordic", "nordics", "latam", "us", "uk", "seed", "growth", "early", "late",
+              "opportunity", "opportunities", "climate", "impact", "sport", "sports", "health", "bio"}
+
+LSH_BANDS, LSH_ROWS = 16, 4
+WINDOW = 10
+SAME_DOMAIN_SIM, NAME_SIM = 0.5, 0.75
+_SEED = 20240601
+_CHUNK = 1 << 16                       # shingles hashed per batch (x LSH_BANDS*LSH_ROWS uint64)
+
+DEDUP_COLUMNS = ["cluster","kept","name","website","type","hq_raw","cheque_min","cheque_max","source"]
+
+# ---------- normalisation ----------
+def norm_domain(url) -> str:
+    """' https://www.Lakestar.com/en/' -> 'lakestar.com' ('' for shared hosts)."""
+    s = str(url or "").strip().lower()
+    s = re.sub(r"^[a-z]+://", "", s).split("/")[0].split("?")[0].split(":")[0]
+    s = s.removeprefix("www.").strip(".")
+    return "" if "." not in s or s in SHARED_HOSTS else s
+
+def norm_path(url) -> str:
+    """'https://x.com/Funds/Sport/?a=1' -> 'funds/sport' ('' for the site root)."""
+    s = re.sub(r"^[a-z]+://", "", str(url or "").strip().lower())
+    return s.partition("/")[2].split("?")[0].split("#")[0].strip("/")
+
+def norm_name(name) -> str:
+    """'Lakestar Advisors GmbH' -> 'lakestar advisors' (ascii, no punctuation / legal form)."""
+    s = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode().lower()
+    return " ".join(t for t in re.sub(r"[^a-z0-9]+", " ", s).split() if t not in LEGAL_FORMS)
+
+_ROMAN = re.compile(r"^(?=[ivxl]+$)l?x{0,3}(ix|iv|v?i{0,3})$")
+
+def name_tag(name: str) -> str:
+    """Numbers, roman numerals and QUALIFIERS of a normalised name, in order ('' when none)."""
+    return " ".join(t for t in name.split() if t.isdigit() or _ROMAN.match(t) or t in QUALIFIERS)
+
+def shingles(name: str, k=3) -> set:
+    s = f" {name} "
+    return {s[i:i + k] for i in range(max(1, len(s) - k + 1))} if name else set()
+
+# ---------- MinHash ----------
+def minhash(names: list, perms=LSH_BANDS * LSH_ROWS) -> np.ndarray:
+    """(n, perms) uint32 signatures of the names' 3-grams; all-max rows for empty names."""
+    ids, owner, uniq = [], [], {}
+    for i, nm in enumerate(names):
+        for g in shingles(nm):
+            ids.append(uniq.setdefault(g, len(uniq))); owner.append(i)
+    ids = np.asarray(ids, dtype=np.int64); owner = np.asarray(owner, dtype=np.int64)
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, 2**63, perms, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, perms, dtype=np.uint64)
+    table = np.empty((len(uniq), perms), dtype=np.uint32)                # hashes of each distinct 3-gram
+    for lo in range(0, len(uniq), _CHUNK):
+        x = np.arange(lo, min(lo + _CHUNK, len(uniq)), dtype=np.uint64)[:, None]
+        table[lo:lo + len(x)] = (a * x + b) >> np.uint64(32)              # multiply-shift hashing
+    sig = np.full((len(names), perms), np.iinfo(np.uint32).max, dtype=np.uint32)
+    for lo in range(0, len(ids), _CHUNK):
+        h = table[ids[lo:lo + _CHUNK]]
+        own = owner[lo:lo + _CHUNK]                                      # sorted: shingles come row by row
+        starts = np.flatnonzero(np.r_[True, own[1:] != own[:-1]])
+        rows = own[starts]
+        sig[rows] = np.minimum(sig[rows], np.minimum.reduceat(h, starts, axis=0))
+    return sig
+
+def similarity(sig: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """MinHash estimate of the Jaccard similarity of pairs (i, j)."""
+    out = np.empty(len(i))
+    for lo in range(0, len(i), _CHUNK):
+        out[lo:lo + _CHUNK] = (sig[i[lo:lo + _CHUNK]] == sig[j[lo:lo + _CHUNK]]).mean(axis=1)
+    return out
+
+# ---------- blocking ----------
+def block_pairs(keys: np.ndarray, order_key: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """(m, 2) pairs (i < j) of valid rows sharing a key and less than WINDOW apart in
+    order_key order within it."""
+    rows = np.flatnonzero(valid)
+    rows = rows[np.lexsort((rows, order_key[rows], keys[rows]))]
+    k = keys[rows]
+    out = [np.empty((0, 2), dtype=np.int64)]
+    for d in range(1, WINDOW):
+        same = k[:-d] == k[d:]
+        if not same.any():
+            break
+        out.append(np.sort(np.column_stack([rows[:-d][same], rows[d:][same]]), axis=1))
+    return np.concatenate(out)
+
+def candidate_blocks(domains: np.ndarray, sig: np.ndarray, order_key: np.ndarray):
+    """Candidate pairs of the domain block (domains: int codes, 0 = none), then of
+    each LSH band (pairs may repeat across blocks)."""
+    yield block_pairs(domains, order_key, domains > 0)
+    named = sig[:, 0] != np.iinfo(np.uint32).max
+    for band in range(LSH_BANDS):
+        cols = np.ascontiguousarray(sig[:, band * LSH_ROWS:(band + 1) * LSH_ROWS])
+        _, bucket = np.unique(cols.view(np.dtype((np.void, cols.itemsize * LSH_ROWS))).ravel(),
+                              return_inverse=True)
+        yield block_pairs(bucket.ravel(), order_key, named)
+
+def clusters(n: int, pairs: np.ndarray, sim: np.ndarray, domains, paths, order_key, lo, hi) -> np.ndarray:
+    """Clusters of the merged pairs, most similar pairs first, joining two clusters only
+    when no member of one conflicts with a member of the other (same rules as a pair):
+    at most one domain, no two names on distinct pages of it, and one common cheque
+    range (lo / hi: range bounds of valid-range rows, -inf / +inf on the others; ranges
+    overlap pairwise iff max(lo) <= min(hi)). Returns the smallest row index of each
+    row's cluster."""
+    parent = list(range(n))
+    dom, rng = domains.tolist(), np.column_stack([lo, hi]).tolist()
+    pages = [{(p, k)} if d and p else set() for d, p, k in zip(dom, paths.tolist(), order_key.tolist())]
+
+    def find(r):
+        while parent[r] != r:
+            parent[r] = r = parent[parent[r]]
+        return r
+
+    for k in np.lexsort((pairs[:, 1], pairs[:, 0], -sim)).tolist():
+        a, b = find(int(pairs[k, 0])), find(int(pairs[k, 1]))
+        if a == b or (dom[a] and dom[b] and dom[a] != dom[b]):
+            continue
+        if max(rng[a][0], rng[b][0]) > min(rng[a][1], rng[b][1]):
+            continue
+        if any(p != q and x != y for p, x in pages[a] for q, y in pages[b]):
+            continue
+        a, b = min(a, b), max(a, b)
+        parent[b] = a
+        dom[a] = dom[a] or dom[b]
+        rng[a] = [max(rng[a][0], rng[b][0]), min(rng[a][1], rng[b][1])]
+        pages[a] |= pages[b]
+    return np.array([find(r) for r in range(n)], dtype=np.int64)
+
+# ---------- merge ----------
+def merge_investors(paths, types=None, cache=True, cache_dir=None) -> dict:
+    """Parsed tables of several exports concatenated (in path order), plus their "source"."""
+    out = {k: [] for k in INVESTOR_FIELDS + ["source"]}
+    for path in paths:
+        inv = load_investors(path, cache=cache, cache_dir=cache_dir)
+        keep = [i for i, t in enumerate(inv["type"]) if types is None or t in types]
+        for k in INVESTOR_FIELDS:
+            out[k] += [inv[k][i] for i in keep]
+        out["source"] += [f"{Path(path).name}#{i + 1}" for i in keep]
+    return out
+
+def dedup_investors(inv: dict) -> tuple:
+    """-> (merged table, report rows for the clusters of 2+ records)."""
+    n = len(inv["name"])
+    names = [norm_name(x) for x in inv["name"]]
+    codes = lambda values: np.unique(np.array([""] + values, dtype=object), return_inverse=True)[1].ravel()[1:]
+    domains = codes([norm_domain(x) for x in inv["website"]])           # "" sorts first -> code 0
+    paths = codes([norm_path(x) for x in inv["website"]])
+    tags, order_key = codes([name_tag(x) for x in names]), codes(names)
+    mins, maxs = np.asarray(inv["cheque_min"], dtype=np.int64), np.asarray(inv["cheque_max"], dtype=np.int64)
+    valid = (mins > 0) & (maxs > 0) & (maxs >= mins)
+    sig = minhash(names)
+    merged, merged_sim = [np.empty((0, 2), dtype=np.int64)], [np.empty(0)]
+    for pairs in candidate_blocks(domains, sig, order_key):
+        i, j = pairs[:, 0], pairs[:, 1]
+        ok = (tags[i] == tags[j]) & ((domains[i] == domains[j]) | (domains[i] == 0) | (domains[j] == 0))
+        ok &= ~(valid[i] & valid[j] & ((maxs[i] < mins[j]) | (maxs[j] < mins[i])))        # disjoint ranges
+        same = (domains[i] == domains[j]) & (domains[i] > 0)
+        ok &= ~(same & (order_key[i] != order_key[j]) & (paths[i] > 0) & (paths[j] > 0) & (paths[i] != paths[j]))
+        pairs, same = pairs[ok], same[ok]
+        sim = similarity(sig, pairs[:, 0], pairs[:, 1])
+        near = same & (sim >= SAME_DOMAIN_SIM) & (sim < NAME_SIM)
+        if near.any():                                   # few pairs: word containment in Python
+            words = lambda r: set(names[r].split())
+            near[near] = [words(a) <= words(b) or words(b) <= words(a) for a, b in pairs[near].tolist()]
+        keep = (sim >= NAME_SIM) | near
+        merged.append(pairs[keep]); merged_sim.append(sim[keep])
+    pairs, first = np.unique(np.concatenate(merged), axis=0, return_index=True)
+    inf = np.float64(np.inf)
+    label = clusters(n, pairs, np.concatenate(merged_sim)[first], domains, paths, order_key,
+                     np.where(valid, mins, -inf), np.where(valid, maxs, inf))
+
+    filled = ((mins > 0).astype(np.int64) + (maxs > 0)
+              + np.array([bool(v) for v in inv["stage_raw"]]) + np.array([bool(v) for v in inv["countries_raw"]]))
+    order = np.lexsort((np.arange(n), -filled, label))                  # by cluster, then merge priority
+    starts = np.flatnonzero(np.r_[True, label[order][1:] != label[order][:-1]])
+    ends = np.r_[starts[1:], n]
+    src = inv.get("source") or [f"#{i + 1}" for i in range(n)]
+
+    first = order[starts].tolist()                              # single records are kept as they are
+    out = {k: [inv[k][i] for i in first] for k in INVESTOR_FIELDS}
+    out["source"], out["dup_count"] = [src[i] for i in first], (ends - starts).tolist()
+    report = []
+    for c in np.flatnonzero(ends - starts > 1).tolist():
+        members = order[starts[c]:ends[c]].tolist()
+        rec = {k: next((inv[k][i] for i in members if inv[k][i]), inv[k][members[0]])
+               for k in ("name", "website", "type", "hq_raw", "countries_raw", "stage_raw")}
+        valid = [i for i in members if mins[i] > 0 and maxs[i] > 0 and maxs[i] >= mins[i]]
+        if valid:
+            lo, hi = int(mins[valid[0]]), int(maxs[valid[0]])
+        else:
+            lo = next((int(mins[i]) for i in members if mins[i] > 0), 0)
+            hi = next((int(maxs[i]) for i in members if maxs[i] > 0), 0)
+        flag = confidence_flag(lo > 0, hi > 0, bool(rec["stage_raw"]), bool(rec["countries_raw"]))
+        rec.update(cheque_min=lo, cheque_max=hi, confidence=flag, malus=malus_from_confidence(flag),
+                   source="|".join(src[i] for i in members), dup_count=len(members))
+        for k in out:
+            out[k][c] = rec[k]
+        if len(members) > 1:
+            for rank, i in enumerate(members):
+                report.append({"cluster": c, "kept": rank == 0, "name": inv["name"][i], "website": inv["website"][i],
+                               "type": inv["type"][i], "hq_raw": inv["hq_raw"][i], "cheque_min": int(mins[i]),
+                               "cheque_max": int(maxs[i]), "source": src[i]})
+    return out, report
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# AIx — incremental re-scoring from one OpenVC export to the next
+# Every run leaves a per-country state next to the outputs (<out>/.aix_state/<slug>.npz):
+# a key (name + website, numbered when the pair repeats) and a content digest for every
+# CSV row, the scored full-output frame, the tier counts and the Top-N keys. The next
+# run only parses and scores rows whose digest changed (added / updated / removed),
+# patches the stored frame, adjusts the counts, re-ranks only the scenarios whose
+# Top-N the delta can reach, and logs tier moves to aix_changes_<slug>_v4.csv.
+# Outputs are the ones a fresh build of the new CSV writes. Without a usable state
+# (first run, other targets, parser version, country table or scoring code) every row
+# counts as new.
+
+import csv, hashlib, inspect, json
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aix_builder import (INVESTOR_FIELDS, PARSER_VERSION, get_country, is_nullable, label_for, norm, _parse_row,
+                         finish_investors, select_country, score_selected, top_selection, top_frame, summary_from_counts,
+                         output_paths)
+from aix_cache import save_table, load_table
+import aix_builder, aix_core, aix_countries
+
+STATE_VERSION = 1
+CHANGE_COLUMNS = ["scenario","fund_name","website","change","tier_before","tier_after",
+                  "aix_before","aix_after"]
+
+# ---------- row identity ----------
+def row_key(name, website) -> str:
+    return f"{(name or '').strip().lower()}\x1f{(website or '').strip().lower()}"
+
+def row_digest(row: dict, fields) -> int:
+    raw = "\x1f".join(row.get(f) or "" for f in fields).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little", signed=True)
+
+def scan_csv(path, known, types=None) -> tuple:
+    """One pass over the CSV: key and digest of every row; rows that some state in
+    known ({key: (digest, pos)} per country) does not hold as-is are parsed.
+
+    Returns (keys, digests, delta_inv, delta_rows) with delta_rows the CSV row of
+    every parsed row.
+    """
+    keys, digests, rows, seen = [], [], [], Counter()
+    inv = {k: [] for k in INVESTOR_FIELDS}
+    with open(path, newline="", encoding="utf-8") as f:
+        r = csv.DictReader(f)
+        col = {norm(c): c for c in r.fieldnames or []}
+        name_c, web_c = col.get("investor_name", ""), col.get("website", "")
+        for i, row in enumerate(r):
+            base = row_key(row.get(name_c), row.get(web_c))
+            key = f"{base}\x1f{seen[base]}"; seen[base] += 1
+            d = row_digest(row, r.fieldnames)
+            keys.append(key); digests.append(d)
+            if any(k.get(key, (None,))[0] != d for k in known):
+                n = len(inv["name"])
+                _parse_row(inv, row, col, types)
+                if len(inv["name"]) > n:
+                    rows.append(i)
+    return keys, np.asarray(digests, dtype=np.int64), finish_investors(inv), np.asarray(rows, dtype=np.int64)
+
+# ---------- state ----------
+# what a stored frame was scored with besides the parsed rows: edits to any of these
+# (or to the country table) make every stored row stale
+_SCORING = [aix_core.score_grid, aix_core.score_matrix, aix_core.as_column, aix_builder._score_table,
+            aix_builder.select_country, aix_builder.confidence_flag, aix_builder.malus_from_confidence,
+            aix_countries.compile_matcher, aix_countries.focus_from_hits, aix_countries.score_stage,
+            aix_countries.score_masks]
+
+def scoring_digest(code: str) -> str:
+    """Digest of the country table (aliases, keywords, types, scenarios ...) and of the
+    source of the scoring functions."""
+    table = {k: v for k, v in get_country(code).items() if not k.startswith("_")}   # not the compiled regex
+    h = hashlib.blake2b(json.dumps(table, sort_keys=True, default=sorted).encode("utf-8"), digest_size=16)
+    for f in _SCORING:
+        h.update(inspect.getsource(f).encode("utf-8"))
+    return h.hexdigest()
+
+def state_path(code: str, state_dir) -> Path:
+    return Path(state_dir) / f"{get_country(code)['slug']}.npz"
+
+def load_state(path, code: str, targets) -> dict:
+    """Previous run of this country with the same targets, parser and scoring, or None."""
+    try:
+        table, meta = load_table(path, arrays=True)
+        meta = {k: json.loads(v) for k, v in meta.items()}
+    except (OSError, ValueError, KeyError):
+        return None
+    want = {"state": STATE_VERSION, "parser": PARSER_VERSION, "scoring": scoring_digest(code), "code": code,
+            "targets": list(targets)}
+    if any(meta.get(k) != v for k, v in want.items()):
+        return None
+    keys = table["row_key"].tolist()
+    return {"known": dict(zip(keys, zip(table["row_digest"].tolist(), table["row_pos"].tolist()))),
+            "frame": {c: table[f"df.{c}"] for c in meta["columns"]},
+            "columns": meta["columns"], "counts": meta["counts"], "top": meta["top"],
+            "topn": meta["topn"], "tier": meta["tier"]}
+
+def save_state(path, code, targets, keys, digests, pos, df, counts, top, topn, tier) -> None:
+    table = {"row_key": keys, "row_digest": digests, "row_pos": pos}
+    table.update({f"df.{c}": df[c].to_numpy() for c in df.columns})
+    meta = {"state": STATE_VERSION, "parser": PARSER_VERSION, "scoring": scoring_digest(code), "code": code,
+            "targets": list(targets), "columns": list(df.columns), "counts": {lab: dict(c) for lab, c in counts.items()},
+            "top": top, "topn": topn, "tier": tier}
+    save_table(path, table, {k: json.dumps(v) for k, v in meta.items()})
+
+# ---------- patch ----------
+def _top_key(aix, cmax, sf, fc, i) -> tuple:
+    return (aix[i], cmax[i], sf[i], fc[i])
+
+def patch_country(code: str, targets, keys, digests, delta: dict, delta_rows, state, topn=20, tier="A") -> dict:
+    """New full-output frame, Top-N, summary and change log of one country from the
+    previous state plus the re-scored delta rows."""
+    labs = [label_for(t) for t in targets]
+    base = select_country(delta, code)
+    fresh_df = score_selected(base, code, targets)
+    fresh_csv = delta_rows[np.asarray(base["row"], dtype=np.int64)]
+    columns = list(fresh_df.columns)
+    if state and state["columns"] != columns:
+        state = None
+    known = state["known"] if state else {}
+    old = state["frame"] if state else {c: fresh_df[c].to_numpy()[:0] for c in columns}
+    n_old = len(old["status"])
+
+    # where every CSV row comes from: the old frame (unchanged), the delta, or nowhere
+    n = len(keys)
+    changed = np.ones(n, dtype=bool); src = np.full(n, -1, dtype=np.int64)
+    for i, (k, d) in enumerate(zip(keys, digests.tolist())):
+        hit = known.get(k)
+        if hit is not None and hit[0] == d:
+            changed[i], src[i] = False, hit[1]
+    fresh_pos = np.full(n, -1, dtype=np.int64); fresh_pos[fresh_csv] = np.arange(len(fresh_csv))
+    src = np.where(changed, np.where(fresh_pos >= 0, n_old + fresh_pos, -1), src)
+    in_frame = src >= 0
+    take = src[in_frame]
+    pos = np.full(n, -1, dtype=np.int64); pos[in_frame] = np.arange(len(take))
+
+    frame = {}
+    for c in columns:
+        a, b = old[c], fresh_df[c].to_numpy()
+        if not len(b):                                   # empty delta frame: no dtype of its own
+            b = b.astype(a.dtype)
+        if is_nullable(c):
+            a, b = a.astype(np.float64), b.astype(np.float64)
+        frame[c] = np.concatenate([a, b])[take]
+    if not (frame["status"] != "scored").any():
+        frame.update({c: frame[c].astype(np.int64) for c in columns if is_nullable(c)})
+    df = pd.DataFrame(frame, columns=columns)
+
+    # tier counts: old minus the rows that left, plus the re-scored ones
+    gone = np.setdiff1d(np.arange(n_old), take[take < n_old])
+    added = np.flatnonzero(take >= n_old)
+    counts = {}
+    for lab in labs:
+        c = Counter(state["counts"][lab]) if state else Counter()
+        c.subtract(old[f"tier_{lab}"][gone].tolist())
+        c.update(frame[f"tier_{lab}"][added].tolist())
+        counts[lab] = Counter({t: v for t, v in c.items() if v})
+
+    # Top-N: a scenario is re-ranked only if a ranked fund left or a new one can enter
+    csv_of = np.flatnonzero(in_frame)
+    prev_top = state["top"] if state and state["topn"] == topn and state["tier"] == tier else None
+    gone_set = set(gone.tolist())
+    row_of = {k: i for i, k in enumerate(keys)} if prev_top else {}
+    cmax, sf, fc = frame["cheque_max"], frame["sf"], frame["fc"]
+    rows, cols, rank, redo = [], [], [], []
+    for j, lab in enumerate(labs):
+        tiers = frame[f"tier_{lab}"][added]
+        entering = added[(tiers != "U") if tier == "any" else (tiers == tier)]
+        old_top = [known[k][1] for k in prev_top[lab]] if prev_top else None
+        if old_top is None or gone_set.intersection(old_top):
+            redo.append(j); continue
+        if entering.size:
+            if len(old_top) < topn:
+                redo.append(j); continue
+            o = state["frame"]; last = old_top[-1]
+            nth = _top_key(o[f"aix_{lab}"], o["cheque_max"], o["sf"], o["fc"], last)
+            aix = frame[f"aix_{lab}"]
+            if any(_top_key(aix, cmax, sf, fc, i) >= nth for i in entering):
+                redo.append(j); continue
+        keep = pos[[row_of[k] for k in prev_top[lab]]]
+        rows.append(keep); cols.append(np.full(len(keep), j)); rank.append(np.arange(1, len(keep) + 1))
+    if redo:
+        r, c, k = top_selection(df, [labs[j] for j in redo], topn, tier)
+        rows.append(r); cols.append(np.asarray(redo, dtype=np.int64)[c]); rank.append(k)
+    rows, cols, rank = (np.concatenate(v).astype(np.int64) if v else np.empty(0, dtype=np.int64)
+                        for v in (rows, cols, rank))
+    order = np.lexsort((rank, cols))
+    rows, cols, rank = rows[order], cols[order], rank[order]
+    top = top_frame(df, labs, rows, cols, rank)
+    top_keys = {lab: [keys[csv_of[r]] for r in rows[cols == j].tolist()] for j, lab in enumerate(labs)}
+
+    # change log: tier moves of every added / updated / removed fund, per scenario
+    moves = []
+    if state:
+        current = set(keys)
+        for i in np.flatnonzero(changed).tolist():
+            p_old = known.get(keys[i], (None, -1))[1]
+            if p_old >= 0 or pos[i] >= 0:
+                moves.append((p_old, int(pos[i])))
+        moves += [(p, -1) for k, (_, p) in known.items() if p >= 0 and k not in current]
+    log = []
+    for lab in labs:
+        for p_old, p_new in moves:
+            before = state["frame"][f"tier_{lab}"][p_old] if p_old >= 0 else ""
+            after = frame[f"tier_{lab}"][p_new] if p_new >= 0 else ""
+            if before == after:
+                continue
+            src_f, p = (frame, p_new) if p_new >= 0 else (state["frame"], p_old)
+            log.append({"scenario": lab, "fund_name": src_f["name"][p], "website": src_f["website"][p],
+                        "change": "added" if p_old < 0 else "removed" if p_new < 0 else "updated",
+                        "tier_before": before, "tier_after": after,
+                        "aix_before": state["frame"][f"aix_{lab}"][p_old] if p_old >= 0 else np.nan,
+                        "aix_after": frame[f"aix_{lab}"][p_new] if p_new >= 0 else np.nan})
+    changes = pd.DataFrame(log, columns=CHANGE_COLUMNS).astype({"aix_before": "Int64", "aix_after": "Int64"})
+
+    return {"df": df, "top": top, "summary": summary_from_counts(labs, counts), "changes": changes,
+            "pos": pos, "counts": counts, "top_keys": top_keys, "fresh": state is None,
+            "stats": (int(len(added)), int(len(gone)), len(redo), len(labs))}
+
+# ---------- driver ----------
+def incremental_build(path, countries=("FR",), targets=None, out_dir=".", state_dir=None, topn=20, tier="A") -> None:
+    """Update every country's outputs in out_dir from the CSV, re-scoring only what changed."""
+    state_dir = Path(state_dir or Path(out_dir) / ".aix_state")
+    codes = [c.upper() for c in countries]
+    plan = {c: tuple(targets or get_country(c)["targets"]) for c in codes}
+    states = {c: load_state(state_path(c, state_dir), c, t) for c, t in plan.items()}
+    types = set().union(*(get_country(c)["types"] for c in codes))
+    keys, digests, delta, delta_rows = scan_csv(
+        path, [s["known"] if s else {} for s in states.values()], types)
+
+    for code, t in plan.items():
+        res = patch_country(code, t, keys, digests, delta, delta_rows, states[code], topn=topn, tier=tier)
+        full_out, agg_out, summary_out = output_paths(code, out_dir)
+        change_out = Path(out_dir) / f"aix_changes_{get_country(code)['slug']}_v4.csv"
+        res["df"].to_csv(full_out, index=False)
+        res["top"].to_csv(agg_out, index=False)
+        res["summary"].to_csv(summary_out, index=False)
+        res["changes"].to_csv(change_out, index=False)
+        save_state(state_path(code, state_dir), code, t, keys, digests, res["pos"], res["df"],
+                   res["counts"], res["top_keys"], topn, tier)
+        rescored, left, redo, k = res["stats"]
+        how = "no usable state, full build" if res["fresh"] else f"{rescored} rows re-scored, {left} dropped"
+        print(f"[Incremental] {code}: {how}; {redo}/{k} scenarios re-ranked")
+        print(f"[Changes] wrote {len(res['changes'])} tier moves -> {change_out}")
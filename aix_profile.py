@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# AIx — opt-in stage instrumentation (--profile PATH or AIX_PROFILE=PATH)
+# Off by default: stage() then hands back a shared no-op context and the counters
+# return at once, so the builders pay one check per stage. When on, each stage records
+# wall and CPU time and rows in/out; drop() tracks rows kept per filter (investor type,
+# country, Tier U), count() collects cache hits and CSV decode time, and finish()
+# writes the whole report as JSON with the peak RSS of the process.
+# With a cProfile path the scoring stages also run under cProfile; the .pstats file
+# opens in pstats, snakeviz, or flameprof / gprof2dot for a flame graph.
+
+import cProfile, json, os, resource, sys, time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_ENV = "AIX_PROFILE"
+
+_state = None
+_NULL = nullcontext({})
+
+def start(path=None, cprofile=None) -> bool:
+    """Turn instrumentation on (path '-' = stderr, default $AIX_PROFILE) -> whether it is on."""
+    global _state
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path:
+        return False
+    _state = {"path": path, "wall": time.perf_counter(), "cpu": time.process_time(),
+              "stages": [], "filters": {}, "counters": {},
+              "cprofile": cProfile.Profile() if cprofile else None, "cprofile_path": cprofile}
+    return True
+
+def active() -> bool:
+    return _state is not None
+
+# ---------- recording ----------
+@contextmanager
+def _stage(name, rows_in, hot):
+    rec = {"stage": name, "rows_in": rows_in, "rows_out": None}
+    prof = _state["cprofile"] if hot else None
+    wall, cpu = time.perf_counter(), time.process_time()
+    if prof:
+        prof.enable()
+    try:
+        yield rec
+    finally:
+        if prof:
+            prof.disable()
+        rec["wall_s"] = time.perf_counter() - wall
+        rec["cpu_s"] = time.process_time() - cpu
+        _state["stages"].append(rec)
+
+def stage(name: str, rows_in=None, hot=False):
+    """Context manager timing one stage; set rec["rows_out"] on the yielded dict.
+    hot=True also runs it under cProfile when a cProfile path was given."""
+    return _NULL if _state is None else _stage(name, rows_in, hot)
+
+def drop(name: str, rows_in: int, rows_out: int) -> None:
+    """Rows entering / kept by one filter (summed over calls)."""
+    if _state is None:
+        return
+    f = _state["filters"].setdefault(name, {"rows_in": 0, "rows_out": 0})
+    f["rows_in"] += int(rows_in); f["rows_out"] += int(rows_out)
+
+def count(name: str, n=1) -> None:
+    if _state is not None:
+        _state["counters"][name] = _state["counters"].get(name, 0) + n
+
+def timed_iter(it, name: str):
+    """Yield from it, adding the time spent producing items to counter <name>_s."""
+    it = iter(it)
+    while True:
+        t = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            count(f"{name}_s", time.perf_counter() - t)
+            return
+        count(f"{name}_s", time.perf_counter() - t)
+        yield item
+
+# ---------- report ----------
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024     # bytes on macOS, KiB elsewhere
+
+def finish() -> dict:
+    """Write the JSON report (and .pstats), turn instrumentation off -> report or None."""
+    global _state
+    if _state is None:
+        return None
+    s, _state = _state, None
+    filters = {k: dict(v, dropped=v["rows_in"] - v["rows_out"]) for k, v in s["filters"].items()}
+    report = {"wall_s": time.perf_counter() - s["wall"], "cpu_s": time.process_time() - s["cpu"],
+              "peak_rss_mb": peak_rss_mb(), "stages": s["stages"], "filters": filters,
+              "counters": s["counters"]}
+    text = json.dumps(report, indent=2)
+    if s["path"] == "-":
+        print(text, file=sys.stderr)
+    else:
+        with open(s["path"], "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"[Profile] wrote {len(s['stages'])} stages -> {s['path']}")
+    if s["cprofile"] is not None:
+        s["cprofile"].dump_stats(s["cprofile_path"])
+        print(f"[Profile] cProfile stats -> {s['cprofile_path']}")
+    return report
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# AIx — indexed queries over one scored country (ad-hoc round matching)
+# QueryIndex(table) takes a scored frame, a score_table dict or an aix_snapshot.Snapshot
+# and precomputes, once:
+#   cheque_min / cheque_max   row ids sorted by value -> range filters are two binary searches;
+#                             rows without that cheque (NaN on Tier U, 0 = not stated) are left
+#                             out and kept as posting lists 'unknown:cheque_min' / '...max'
+#   posting lists             sorted row ids per stage class (pre-seed / seed from SF) and
+#                             raw stage token, per (scenario, tier), and per HQ / invest
+#                             country (any registered code, located on first use)
+#   ranks                     per scenario, each row's position in the Top-N order
+#                             (AIx desc, then cheque_max, SF, FC — same keys as top_by_tier)
+# A query intersects its posting lists smallest first, sorts the survivors by rank and
+# returns the offset / limit page; no filter scans the whole table.
+# Usage:
+#   idx = QueryIndex(Snapshot("out/aix_switzerland_v4.aixsnap"))
+#   idx.query(cheque_max_ge=500_000, stage="preseed", hq="CH", scenario="800k", limit=20)
+
+import argparse, sys
+
+import numpy as np
+
+from aix_core import rank_keys
+from aix_countries import COUNTRIES, get_country, locate, stage_masks
+from aix_builder import column, label_for, parse_targets
+
+FUND_COLUMNS = ["name","website","type","hq_raw","countries_raw","stage_raw","cheque_min","cheque_max","sf","fc"]
+STAGE_CLASSES = {"preseed": 20, "seed": 8}                   # SF value of each stage class
+
+def _posting(mask) -> np.ndarray:
+    return np.flatnonzero(mask).astype(np.int32)
+
+class QueryIndex:
+    """Read-only indexes over one scored table (see module header)."""
+
+    def __init__(self, table):
+        self.table = table
+        self._cols = {}
+        names = table.columns if hasattr(table, "columns") else list(table)
+        self.labels = [c[len("aix_"):] for c in names if c.startswith("aix_")]
+        self.n = len(self.col("name"))
+
+        self.sorted, self.postings = {}, {}
+        for k in ("cheque_min", "cheque_max"):
+            v = np.asarray(self.col(k), dtype=np.float64)
+            known = v > 0                                                     # False on NaN
+            self.postings[f"unknown:{k}"] = _posting(~known)
+            rows = np.flatnonzero(known)
+            order = rows[np.argsort(v[rows], kind="stable")].astype(np.int32)
+            self.sorted[k] = (v[order], order)
+
+        sf = np.asarray(self.col("sf"), dtype=np.int64)
+        for name, v in STAGE_CLASSES.items():
+            self.postings[f"stage:{name}"] = _posting(sf == v)
+        masks, tokens = stage_masks(self.col("stage_raw").tolist())
+        for b, tok in enumerate(tokens):
+            self.postings[f"token:{tok}"] = _posting([(m >> b) & 1 for m in masks])
+
+        self.rank, self.order = {}, {}
+        cm = np.asarray(self.col("cheque_max"), dtype=np.float64)
+        for lab in self.labels:
+            tiers = np.asarray(self.col(f"tier_{lab}"), dtype=object)
+            for t in "ABCU":
+                self.postings[f"tier:{lab}:{t}"] = _posting(tiers == t)
+            keys = rank_keys(np.asarray(self.col(f"aix_{lab}"), dtype=np.float64)[:, None], cm, sf,
+                             np.asarray(self.col("fc"), dtype=np.int64), (tiers != "U")[:, None])[:, 0]
+            order = np.lexsort((np.arange(self.n), -keys))
+            rank = np.empty(self.n, dtype=np.int32); rank[order] = np.arange(self.n, dtype=np.int32)
+            self.rank[lab], self.order[lab] = rank, order.astype(np.int32)
+
+    def col(self, name: str) -> np.ndarray:
+        if name not in self._cols:
+            t = self.table
+            self._cols[name] = np.asarray(t.column(name)) if hasattr(t, "manifest") else column(t, name)
+        return self._cols[name]
+
+    # ---------- filters ----------
+    def range(self, col: str, lo=None, hi=None) -> np.ndarray:
+        """Sorted row ids with lo <= col <= hi (binary search on the sorted column); rows
+        where the cheque is unknown never match."""
+        vals, order = self.sorted[col]
+        a = 0 if lo is None else np.searchsorted(vals, lo, "left")
+        b = len(vals) if hi is None else np.searchsorted(vals, hi, "right")
+        return np.sort(order[a:b])
+
+    def _locate(self, code: str) -> None:
+        t = get_country(code)
+        hits = [locate(t, h, c) for h, c in zip(self.col("hq_raw").tolist(), self.col("countries_raw").tolist())]
+        self.postings[f"invests:{code}"] = _posting([("country" in i) for _, i in hits])
+        self.postings[f"hq:{code}"] = _posting([("country" in h) for h, _ in hits])
+
+    def posting(self, key: str) -> np.ndarray:
+        """Sorted row ids of one posting list ('hq:CH', 'stage:preseed', 'tier:800k:A' ...)."""
+        kind, _, code = key.partition(":")
+        if key not in self.postings and kind in ("hq", "invests") and code in COUNTRIES:
+            self._locate(code)
+        if key not in self.postings:
+            raise KeyError(f"no posting list '{key}'")
+        return self.postings[key]
+
+    def select(self, cheque_max_ge=None, cheque_max_le=None, cheque_min_ge=None, cheque_min_le=None,
+               stage=None, token=None, hq=None, invests=None, tier=None, scenario=None) -> np.ndarray:
+        """Sorted row ids matching every given filter (tier needs scenario)."""
+        lists = []
+        if cheque_max_ge is not None or cheque_max_le is not None:
+            lists.append(self.range("cheque_max", cheque_max_ge, cheque_max_le))
+        if cheque_min_ge is not None or cheque_min_le is not None:
+            lists.append(self.range("cheque_min", cheque_min_ge, cheque_min_le))
+        if stage is not None:
+            lists.append(self.posting("stage:" + stage.lower().replace("-", "").replace(" ", "")))
+        if token is not None:
+            lists.append(self.posting(f"token:{token.strip().lower()}"))
+        for key, code in (("hq", hq), ("invests", invests)):
+            if code is not None:
+                lists.append(self.posting(f"{key}:{code.upper()}"))
+        if tier is not None:
+            lists.append(self.posting(f"tier:{self.scenario(scenario)}:{tier}"))
+        if not lists:
+            return np.arange(self.n, dtype=np.int32)
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def scenario(self, scenario) -> str:
+        """'800k', 800000 or '0.8M' -> a scenario label of the table."""
+        if scenario is None:
+            raise ValueError("a scenario is needed to filter or order by tier / AIx")
+        lab = scenario if scenario in self.labels else label_for(parse_targets(str(scenario), default=(0,))[0])
+        if lab not in self.labels:
+            raise KeyError(f"scenario '{scenario}' not scored (have {', '.join(self.labels)})")
+        return lab
+
+    # ---------- queries ----------
+    def query(self, scenario=None, offset=0, limit=20, columns=FUND_COLUMNS, **filters) -> dict:
+        """Filtered rows ordered by AIx at scenario (Top-N order), one offset / limit page
+        -> {column: array} with aix, tier and rank (1-based) at that scenario, plus "row"
+        and "total" (matches before paging)."""
+        lab = self.scenario(scenario)
+        rows = self.select(scenario=lab, **filters)
+        total = len(rows)
+        r = self.rank[lab][rows]
+        stop = min(total, offset + limit)
+        if stop <= offset:
+            page = rows[:0]
+        elif total == self.n:                                    # no filter: the precomputed order
+            page = self.order[lab][offset:stop]
+        else:
+            part = np.argpartition(r, stop - 1)[:stop] if stop < total else np.arange(total)
+            page = rows[part[np.argsort(r[part], kind="stable")]][offset:stop]
+        out = {"row": page, "rank": self.rank[lab][page] + 1}
+        for c in columns:
+            out[c] = self.col(c)[page]
+        out[f"aix_{lab}"], out[f"tier_{lab}"] = self.col(f"aix_{lab}")[page], self.col(f"tier_{lab}")[page]
+        out["total"] = total
+        return out
+
+    def count(self, **filters) -> int:
+        return len(self.select(**filters))
+
+# ---------- CLI ----------
+def _amount(txt: str) -> int:
+    v = parse_targets(txt, default=())
+    if len(v) != 1:
+        raise argparse.ArgumentTypeError(f"not an amount: '{txt}'")
+    return v[0]
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Filtered, ranked AIx queries over a scored snapshot")
+    p.add_argument("snapshot", help=".aixsnap directory written by aix_builder.py --snapshot")
+    p.add_argument("--scenario", required=True, help="Order by AIx at this scenario, e.g. '800k'")
+    p.add_argument("--max-ge", type=_amount, default=None,
+                   help="cheque_max >= this, e.g. 500k (cheque filters skip funds without that cheque)")
+    p.add_argument("--max-le", type=_amount, default=None)
+    p.add_argument("--min-ge", type=_amount, default=None)
+    p.add_argument("--min-le", type=_amount, default=None)
+    p.add_argument("--stage", default=None, choices=list(STAGE_CLASSES))
+    p.add_argument("--hq", default=None, help=f"HQ country ({','.join(COUNTRIES)})")
+    p.add_argument("--invests", default=None, help="Invests in this country")
+    p.add_argument("--tier", default=None, choices=list("ABCU"))
+    p.add_argument("--offset", type=int, default=0)
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--out", default=None, help="CSV output (default: stdout)")
+    args = p.parse_args(argv)
+
+    from aix_snapshot import Snapshot
+    from aix_builder import write_csv
+    try:
+        idx = QueryIndex(Snapshot(args.snapshot))
+        res = idx.query(scenario=args.scenario, offset=args.offset, limit=args.limit, cheque_max_ge=args.max_ge,
+                        cheque_max_le=args.max_le, cheque_min_ge=args.min_ge, cheque_min_le=args.min_le,
+                        stage=args.stage, hq=args.hq, invests=args.invests, tier=args.tier)
+    except (KeyError, ValueError, OSError) as e:
+        p.error(e.args[0] if isinstance(e, KeyError) else str(e))
+    total = res.pop("total")
+    write_csv(res, args.out or sys.stdout)
+    print(f"[Query] {len(res['row'])} of {total} matches", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# AIx — sensitivity of tiers and Top-N to the formula's parameters
+# The knobs of the AIx formula (AC max and cap, FS band, SF / FC / malus values, tier
+# cut-offs) are evaluated for a whole grid of combinations in batched score_grid calls
+# over one country's located funds: combinations on axis 0, funds on axis 1, targets on
+# axis 2. Per combination and scenario it reports the A/B/C/U counts and their shift
+# from the published parameters, the share of the baseline Top-N still in the Top-N,
+# and the Kendall tau-b between both Top-N rankings (a fund missing from a list takes
+# rank N+1 there). AIx keeps the published normalisation (raw score × 100/90), so a
+# larger SF / FC / AC max really moves funds up; with rescale (--grid-rescale) the raw
+# maximum AC max + 25 + SF pre-seed + FC HQ maps to 100 instead, which keeps every
+# combination on 0–100 but cancels most of a uniform change to those knobs.
+# Usage: python aix_builder.py --countries FR --grid "ac_max=25:35:5;cut_a=70,75,80"
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from aix_core import score_grid, dense_rank, top_n
+
+BASELINE = {"ac_max": 30, "ac_cap": 15, "band_lo": 0.6, "band_hi": 1.1,
+            "sf_preseed": 20, "sf_seed": 8, "fc_hq": 15, "fc_invest": 10, "fc_europe": 5,
+            "malus_mid": -5, "malus_low": -10, "cut_a": 75, "cut_b": 55}
+
+PUBLISHED_NORM = 90                   # raw maximum of the published formula (30 + 25 + 20 + 15)
+_CELLS = 500_000                      # combinations × funds × targets scored per batch
+
+# ---------- grid ----------
+def parse_grid(spec: str) -> pd.DataFrame:
+    """'ac_max=25:35:5;cut_a=70,75,80' -> one row per combination (cartesian product),
+    unlisted knobs at their BASELINE value."""
+    axes = {}
+    for part in filter(None, (p.strip() for p in str(spec).split(";"))):
+        name, _, vals = part.partition("=")
+        name = name.strip()
+        if name not in BASELINE:
+            raise ValueError(f"unknown parameter '{name}' (known: {', '.join(BASELINE)})")
+        try:
+            if ":" in vals:
+                start, stop, step = (float(x) for x in vals.split(":"))
+                if step <= 0 or stop < start:
+                    raise ValueError
+                axes[name] = np.round(np.arange(start, stop + step / 2, step), 6).tolist()
+            else:
+                axes[name] = [float(x) for x in vals.split(",") if x.strip()]
+        except ValueError:
+            raise ValueError(f"invalid values in '{part}' (use v1,v2,... or START:STOP:STEP)") from None
+        if not axes[name]:
+            raise ValueError(f"no values in '{part}'")
+    grid = pd.DataFrame(list(itertools.product(*axes.values())), columns=list(axes))
+    if grid.empty:
+        grid = pd.DataFrame(index=[0])
+    for k, v in BASELINE.items():
+        if k not in grid:
+            grid[k] = v
+    return grid[list(BASELINE)]
+
+# ---------- batched scoring ----------
+def fund_classes(base: dict) -> tuple:
+    """Parameter-free classes of each fund from its published SF / FC / malus:
+    stage (2 pre-seed, 1 seed, 0), focus (3 HQ, 2 invest, 1 Europe, 0), confidence (0 high, 1 mid, 2 low)."""
+    sf, fc, malus = (np.asarray(base[k], dtype=np.int64) for k in ("sf", "fc", "malus"))
+    stage = np.select([sf == 20, sf == 8], [2, 1], 0)
+    focus = np.select([fc == 15, fc == 10, fc == 5], [3, 2, 1], 0)
+    conf = np.select([malus == -5, malus == -10], [1, 2], 0)
+    return stage, focus, conf
+
+def grid_scores(base: dict, targets, grid: pd.DataFrame, rescale=False) -> dict:
+    """score_grid for every (combination, fund, target) -> arrays of shape (P, n, k),
+    plus the per-combination sf / fc (P, n, 1). rescale: normalise by each combination's
+    raw maximum instead of the published 90."""
+    g = {k: grid[k].to_numpy(dtype=np.float64)[:, None, None] for k in BASELINE}
+    stage, focus, conf = (c[None, :, None] for c in fund_classes(base))
+    sf = np.select([stage == 2, stage == 1], [g["sf_preseed"], g["sf_seed"]], 0.0)
+    fc = np.select([focus == 3, focus == 2, focus == 1], [g["fc_hq"], g["fc_invest"], g["fc_europe"]], 0.0)
+    malus = np.select([conf == 1, conf == 2], [g["malus_mid"], g["malus_low"]], 0.0)
+    col = lambda k: np.asarray(base[k], dtype=np.int64)[None, :, None]
+    t = np.asarray(targets, dtype=np.float64)[None, None, :]
+    out = score_grid(col("cheque_min"), col("cheque_max"), sf, fc, malus, t,
+                     ac_max=g["ac_max"], ac_cap=g["ac_cap"], band_lo=g["band_lo"], band_hi=g["band_hi"],
+                     norm=g["ac_max"] + 25 + g["sf_preseed"] + g["fc_hq"] if rescale else PUBLISHED_NORM,
+                     cut_a=g["cut_a"], cut_b=g["cut_b"], capped=stage < 2)
+    out["sf"], out["fc"] = sf, fc
+    return out
+
+def _top_lists(s: dict, cheque_max, topn: int, tier: str) -> list:
+    """Top-N fund indexes per (combination, target), same order as top_by_tier."""
+    P, n, k = s["codes"].shape
+    eligible = (s["codes"] != 3) if tier == "any" else (s["codes"] == "ABC".index(tier))
+    rc, nc = dense_rank(cheque_max)
+    rs, ns = dense_rank(s["sf"].ravel())
+    rf, nf = dense_rank(s["fc"].ravel())
+    fund = ((rc[None, :] * ns + rs.reshape(P, n)) * nf + rf.reshape(P, n))[:, :, None]
+    aix = np.nan_to_num(s["aix"], nan=0.0).astype(np.int64)
+    keys = np.where(eligible, aix * (nc * ns * nf) + fund, -1)
+    rows, cols, _ = top_n(keys.transpose(1, 0, 2).reshape(n, P * k), topn)
+    bounds = np.searchsorted(cols, np.arange(P * k + 1))
+    return [rows[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+def kendall_tau(a, b) -> float:
+    """Kendall tau-b of two ranked lists of fund indexes over their union
+    (a fund absent from a list is tied last there); NaN below two funds."""
+    items = np.union1d(a, b)
+    if len(items) < 2:
+        return np.nan
+    ra = np.full(len(items), len(a) + 1.0); ra[np.searchsorted(items, a)] = np.arange(1, len(a) + 1)
+    rb = np.full(len(items), len(b) + 1.0); rb[np.searchsorted(items, b)] = np.arange(1, len(b) + 1)
+    iu = np.triu_indices(len(items), 1)
+    sa, sb = np.sign(ra[:, None] - ra[None, :])[iu], np.sign(rb[:, None] - rb[None, :])[iu]
+    den = np.sqrt(np.count_nonzero(sa) * np.count_nonzero(sb))
+    return float((sa * sb).sum() / den) if den else np.nan
+
+# ---------- report ----------
+def sensitivity(base: dict, targets, grid: pd.DataFrame, topn=20, tier="A", labels=None,
+                rescale=False) -> pd.DataFrame:
+    """One row per (combination, scenario): the combination's knobs, A/B/C/U counts,
+    their shift from BASELINE (d_A ...), topn_kept (share of the baseline Top-N still
+    in it) and kendall_tau (baseline vs combination Top-N). rescale: see grid_scores."""
+    targets = list(targets)
+    labels = labels or [str(t) for t in targets]
+    n, k = len(base["name"]), len(targets)
+    cheque_max = np.asarray(base["cheque_max"], dtype=np.int64)
+
+    ref = grid_scores(base, targets, pd.DataFrame([BASELINE]))
+    ref_counts = np.stack([(ref["codes"][0] == c).sum(axis=0) for c in range(4)], axis=1)   # (k, 4)
+    ref_top = _top_lists(ref, cheque_max, topn, tier)
+
+    out = []
+    step = max(1, _CELLS // max(1, n * k))
+    for lo in range(0, len(grid), step):
+        part = grid.iloc[lo:lo + step]
+        s = grid_scores(base, targets, part, rescale)
+        counts = np.stack([(s["codes"] == c).sum(axis=1) for c in range(4)], axis=2)       # (P, k, 4)
+        tops = _top_lists(s, cheque_max, topn, tier)
+        for p in range(len(part)):
+            knobs = part.iloc[p].to_dict()
+            for j, lab in enumerate(labels):
+                top, ref_j = tops[p * k + j], ref_top[j]
+                row = {"combo": lo + p, **knobs, "scenario": lab}
+                for c, name in enumerate("ABCU"):
+                    row[name] = int(counts[p, j, c])
+                for c, name in enumerate("ABCU"):
+                    row[f"d_{name}"] = int(counts[p, j, c] - ref_counts[j, c])
+                row["topn_kept"] = len(np.intersect1d(top, ref_j)) / len(ref_j) if len(ref_j) else np.nan
+                row["kendall_tau"] = kendall_tau(ref_j, top)
+                out.append(row)
+    return pd.DataFrame(out)
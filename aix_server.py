@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# AIx — long-running scoring service (HTTP on a TCP port or on a Unix socket)
+# Keeps the parsed investor table and each country's located rows (select_country) in
+# memory, so a query only scores one country's funds at the requested targets. Answers
+# are memoised per (country, targets, topn, tier) in an LRU, emptied whenever the CSV
+# changes on disk (stat checked on every request; the reload goes through aix_cache).
+# While the CSV is missing, empty or half-written (mid-replace) the last loaded index
+# keeps serving and /health reports the load error; requests get 503 only until a
+# first load succeeds. The reload parses outside the request lock.
+#   GET /top?country=FR&target=700k&topn=20&tier=A    -> Top-N rows (JSON)
+#   GET /summary?country=CH&targets=300k,800k         -> A/B/C/U counts per scenario
+#   GET /health                                       -> dataset + LRU stats
+# Usage:
+#   python aix_server.py --input OpenVC.csv --port 8765
+#   python aix_server.py --input OpenVC.csv --socket /tmp/aix.sock
+
+import argparse, csv, json, os, socketserver, threading, time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from aix_builder import (DEFAULT_INPUT, COUNTRIES, get_country, parse_countries, parse_targets,
+                         load_investors, select_country, score_selected, top_by_tier,
+                         tiers_summary_by_scenario)
+
+# ---------- warm index ----------
+class IndexUnavailable(RuntimeError):
+    """No index loaded yet (the CSV could not be read so far)."""
+
+# what a CSV caught mid-replace can raise: missing, empty, truncated or half-written
+LOAD_ERRORS = (OSError, ValueError, TypeError, KeyError, IndexError, csv.Error)   # UnicodeDecodeError: ValueError
+
+class AixIndex:
+    """Parsed OpenVC table + per-country rows, reloaded when the CSV changes."""
+
+    def __init__(self, path, countries=None, cache_dir=None, lru_size=256):
+        self.path, self.cache_dir, self.lru_size = Path(path), cache_dir, lru_size
+        self.codes = list(countries or COUNTRIES)
+        self.lock = threading.Lock()                       # index swap, LRU, counters
+        self.reload_lock = threading.Lock()                # one reload at a time
+        self.lru = OrderedDict()
+        self.hits = self.misses = self.reloads = self.reload_errors = 0
+        self.bases, self.stamp, self.rows, self.loaded_at, self.error = None, None, 0, None, None
+        self.bad_stamp = None                              # stamp of a file that failed to load
+        self.refresh()
+
+    def _stamp(self) -> tuple:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, stamp) -> None:
+        types = set().union(*(get_country(c)["types"] for c in self.codes))
+        inv = load_investors(self.path, types=types, cache_dir=self.cache_dir)
+        bases = {c: select_country(inv, c) for c in self.codes}
+        with self.lock:                                    # swap; queries never wait on the parse
+            first = self.bases is None
+            self.bases, self.rows, self.stamp, self.loaded_at = bases, len(inv["name"]), stamp, time.time()
+            self.reloads += not first
+            self.error, self.bad_stamp = None, None
+            self.lru.clear()
+
+    def _failed(self, e, stamp=None) -> None:
+        with self.lock:
+            if self.error is None:
+                print(f"[Serve] cannot load {self.path} ({e}); "
+                      + ("no index yet" if self.bases is None else "serving the loaded index"))
+            self.error, self.bad_stamp = f"{type(e).__name__}: {e}", stamp
+            self.reload_errors += 1
+
+    def refresh(self) -> None:
+        """Reload if the CSV was rewritten since the last load. A missing, empty or
+        half-written file keeps the current index (its error shows in stats()); it is
+        read again once its stamp changes. One thread reloads, the others keep serving."""
+        try:
+            stamp = self._stamp()
+        except OSError as e:
+            return self._failed(e)
+        if stamp == self.stamp:
+            if self.error is not None:                     # file back as loaded
+                self.error = None
+            return
+        if stamp == self.bad_stamp or not self.reload_lock.acquire(blocking=self.bases is None):
+            return
+        try:
+            if stamp != self.stamp:                        # not loaded by another thread meanwhile
+                self._load(stamp)
+        except LOAD_ERRORS as e:
+            self._failed(e, stamp)
+        finally:
+            self.reload_lock.release()
+
+    def query(self, kind: str, code: str, targets: tuple, topn=20, tier="A") -> bytes:
+        """JSON body of a /top or /summary answer, from the LRU when possible."""
+        self.refresh()
+        key = (kind, code, targets, topn, tier)
+        with self.lock:
+            if self.bases is None:
+                raise IndexUnavailable(f"{self.path} not loaded yet: {self.error}")
+            if key in self.lru:
+                self.lru.move_to_end(key); self.hits += 1
+                return self.lru[key]
+            if code not in self.bases:
+                raise ValueError(f"country '{code}' is not loaded (serving: {', '.join(self.codes)})")
+            base, stamp = self.bases[code], self.stamp
+        df = score_selected(base, code, targets)
+        out = top_by_tier(df, targets, topn=topn, tier=tier) if kind == "top" else tiers_summary_by_scenario(df, targets)
+        body = out.to_json(orient="records", force_ascii=False).encode("utf-8")
+        with self.lock:
+            self.misses += 1
+            if stamp == self.stamp:                        # not reloaded meanwhile
+                self.lru[key] = body
+                while len(self.lru) > self.lru_size:
+                    self.lru.popitem(last=False)
+        return body
+
+    def stats(self) -> dict:
+        self.refresh()
+        with self.lock:
+            return {"input": str(self.path), "rows": self.rows, "countries": self.codes,
+                    "funds": {c: len(b["name"]) for c, b in (self.bases or {}).items()},
+                    "loaded_at": self.loaded_at, "reloads": self.reloads,
+                    "reload_errors": self.reload_errors, "error": self.error,
+                    "lru": {"size": len(self.lru), "max": self.lru_size, "hits": self.hits, "misses": self.misses}}
+
+# ---------- HTTP ----------
+class AixHandler(BaseHTTPRequestHandler):
+    index: AixIndex = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == "/health":
+                return self._send(200, json.dumps(self.index.stats()).encode("utf-8"))
+            if url.path not in ("/top", "/summary"):
+                return self._send(404, json.dumps({"error": f"unknown path {url.path}"}).encode("utf-8"))
+            code = parse_countries(q.get("country", "FR"))[0]
+            txt = q.get("targets") or q.get("target")
+            targets = parse_targets(txt, default=()) if txt else tuple(get_country(code)["targets"])
+            if not targets:
+                raise ValueError(f"no valid target in '{txt}'")
+            topn, tier = int(q.get("topn", 20)), q.get("tier", "A")
+            if tier not in ("A", "B", "C", "any"):
+                raise ValueError(f"tier must be A, B, C or any, got '{tier}'")
+            self._send(200, self.index.query(url.path[1:], code, targets, topn, tier))
+        except (ValueError, IndexError) as e:
+            self._send(400, json.dumps({"error": str(e)}).encode("utf-8"))
+        except IndexUnavailable as e:
+            self._send(503, json.dumps({"error": str(e)}).encode("utf-8"))
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def make_server(index: AixIndex, host="127.0.0.1", port=8765, socket_path=None) -> tuple:
+    """-> (server bound to the index, address for the log); port 0 picks a free port."""
+    handler = type("Handler", (AixHandler,), {"index": index})
+    if socket_path:
+        Path(socket_path).unlink(missing_ok=True)
+        return UnixHTTPServer(socket_path, handler), socket_path
+    server = ThreadingHTTPServer((host, port), handler)
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def serve(index: AixIndex, host="127.0.0.1", port=8765, socket_path=None) -> None:
+    server, where = make_server(index, host, port, socket_path)
+    print(f"[Serve] {index.rows} investors, countries {','.join(index.codes)} -> {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path:
+            Path(socket_path).unlink(missing_ok=True)
+
+# ---------- CLI ----------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="AIx scoring service (warm index, LRU answers, CSV hot-reload)")
+    p.add_argument("--input", default=DEFAULT_INPUT, help="OpenVC CSV path")
+    p.add_argument("--countries", default=",".join(COUNTRIES), help="Countries kept in memory")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--socket", default=None, help="Serve on this Unix socket instead of TCP")
+    p.add_argument("--lru", type=int, default=256, help="Memoised answers kept")
+    p.add_argument("--cache-dir", default=None, help="Parsed-CSV cache directory (default: <input dir>/.aix_cache)")
+    args = p.parse_args(argv)
+    index = AixIndex(args.input, parse_countries(args.countries), cache_dir=args.cache_dir, lru_size=args.lru)
+    serve(index, args.host, args.port, args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# AIx — process-pool scoring over byte-range shards of the OpenVC CSV
+# The file is cut into byte ranges that end on real row boundaries: a newline only
+# ends a row when the number of '"' bytes before it is even (quoted fields such as
+# "Investment thesis" may span lines). Each worker parses, filters and scores its
+# range for every country; the per-shard frames are concatenated in file order, so
+# the merged frame is the one build_scores() would have produced. The cheque issues of
+# every shard go back to the parent, which prints one [Parse] summary for the file.
+
+import csv, io, mmap, os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from aix_builder import (INVESTOR_FIELDS, get_country, norm, _parse_row, finish_investors,
+                         merge_issues, report_issues, score_country)
+
+# ---------- shard boundaries ----------
+_BLOCK = 1 << 24
+
+def _quotes(mm, a: int, b: int) -> int:
+    """Number of '"' bytes in mm[a:b], read in bounded slices."""
+    return sum(mm[i:min(b, i + _BLOCK)].count(b'"') for i in range(a, b, _BLOCK))
+
+def _row_end(mm, pos: int, quotes: int) -> int:
+    """First row boundary at or after pos, given the '"' parity of the current row so far.
+    Returns the offset just past the closing newline (or the file size)."""
+    while True:
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            return len(mm)
+        quotes = (quotes + _quotes(mm, pos, nl)) & 1
+        pos = nl + 1
+        if not quotes:
+            return pos
+
+def shard_offsets(path, shards: int) -> tuple:
+    """-> (header bytes, [(start, end), ...]) covering the data rows in order."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b"", []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            head_end = _row_end(mm, 0, 0)
+            bounds, start, size = [], head_end, len(mm)
+            step = max(1, (size - head_end) // max(1, shards))
+            while start < size:
+                target = min(size, start + step)
+                end = _row_end(mm, target, _quotes(mm, start, target) & 1) if target < size else size
+                bounds.append((start, end))
+                start = end
+            return mm[:head_end], bounds
+
+# ---------- workers ----------
+def _score_shard(job) -> tuple:
+    """-> ({code: DataFrame}, cheque issues of the shard)"""
+    path, header, (start, end), codes, targets = job
+    fields = next(csv.reader(io.StringIO(header.decode("utf-8"), newline="")))
+    col = {norm(c): c for c in fields}
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    types = set().union(*(get_country(c)["types"] for c in codes))
+    inv = {k: [] for k in INVESTOR_FIELDS}
+    for row in csv.DictReader(io.StringIO(text, newline=""), fieldnames=fields):
+        _parse_row(inv, row, col, types)
+    issues = {}
+    finish_investors(inv, issues)
+    return {c: score_country(inv, c, targets) for c in codes}, issues
+
+def build_scores_parallel(path, countries=("FR",), targets=None, workers=None, shards=None) -> dict:
+    """build_scores() on a process pool -> {code: DataFrame}, rows in file order."""
+    workers = workers or os.cpu_count() or 1
+    codes = [c.upper() for c in countries]
+    header, bounds = shard_offsets(path, shards or workers * 4)
+    jobs = [(path, header, b, codes, targets) for b in bounds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_score_shard, jobs))
+    parts, issues = [frames for frames, _ in results], {}
+    for _, found in results:                       # shard order = file order
+        merge_issues(issues, found)
+    report_issues(issues)
+    if not parts:                                  # header-only file
+        empty = {k: [] for k in INVESTOR_FIELDS}
+        return {c: score_country(empty, c, targets) for c in codes}
+    out = {}
+    for c in codes:
+        frames = [p[c] for p in parts]
+        keep = [f for f in frames if len(f)] or frames[:1]   # empty shards would turn ints into objects
+        out[c] = pd.concat(keep, ignore_index=True)
+    return out
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# AIx — memory-mappable columnar snapshot of a scored country (--snapshot)
+# A snapshot is a directory <full-output stem>.aixsnap/ holding one plain .npy file per
+# column plus manifest.json:
+#   manifest.json            {"format": "aix-snapshot", "version", "country", "rows",
+#                             "labels": scenario labels, "columns": [{"name", "kind"}]}
+#   <col>.npy                kind "i" (int64) or "f" (float64, NaN on Tier U rows)
+#   <col>.codes.npy          kind "s": int32 index of each row's string in the heap,
+#   <col>.heap.npy           the distinct values as one utf-8 uint8 buffer,
+#   <col>.offsets.npy        and their int64 [start, end) offsets into it
+# Readers np.load(..., mmap_mode="r") each file: nothing is decoded or copied until a
+# column is touched, and concurrent readers share the OS page cache. Top-N and summary
+# come straight from the aix_ / tier_ columns and give the tables write_outputs writes.
+# Usage: python aix_snapshot.py out/aix_france_v4.aixsnap --columns aix_700k,tier_700k
+
+import argparse, json, os, shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aix_cache import _encode_strings
+from aix_compact import expand_frame, is_compact
+
+FORMAT, VERSION = "aix-snapshot", 1
+SUFFIX = ".aixsnap"
+
+def snapshot_path(full_out) -> Path:
+    """aix_france_v4.csv -> aix_france_v4.aixsnap"""
+    return Path(full_out).with_suffix(SUFFIX)
+
+# ---------- write ----------
+def write_snapshot(df: pd.DataFrame, path, code=None) -> Path:
+    """Write a scored frame (either schema) as a snapshot directory, atomically
+    (built next to it, then renamed over any previous one)."""
+    if is_compact(df):
+        df = expand_frame(df)
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    columns = []
+    for col in df.columns:
+        s = df[col]
+        if s.dtype.kind in "iub":
+            kind = "i"; np.save(tmp / f"{col}.npy", s.to_numpy(dtype=np.int64))
+        elif s.dtype.kind == "f":
+            kind = "f"; np.save(tmp / f"{col}.npy", s.to_numpy(dtype=np.float64))
+        else:
+            kind = "s"
+            codes, heap, offsets = _encode_strings(s.tolist())
+            np.save(tmp / f"{col}.codes.npy", codes)
+            np.save(tmp / f"{col}.heap.npy", heap)
+            np.save(tmp / f"{col}.offsets.npy", offsets)
+        columns.append({"name": col, "kind": kind})
+    manifest = {"format": FORMAT, "version": VERSION, "country": code, "rows": len(df),
+                "labels": [c[len("aix_"):] for c in df.columns if c.startswith("aix_")],
+                "columns": columns}
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    if path.exists():
+        old = path.with_name(f"{path.name}.{os.getpid()}.old")
+        os.replace(path, old)
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.replace(tmp, path)
+    return path
+
+# ---------- read ----------
+class Snapshot:
+    """Read-only, lazily mapped view of a snapshot directory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+        if self.manifest.get("format") != FORMAT or self.manifest.get("version") != VERSION:
+            raise ValueError(f"{self.path}: not an {FORMAT} v{VERSION} directory")
+        self.kinds = {c["name"]: c["kind"] for c in self.manifest["columns"]}
+        self.labels = list(self.manifest["labels"])
+        self._maps, self._uniq = {}, {}
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    @property
+    def columns(self) -> list:
+        return list(self.kinds)
+
+    def _map(self, name: str) -> np.ndarray:
+        if name not in self._maps:
+            self._maps[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._maps[name]
+
+    def codes(self, col: str) -> np.ndarray:
+        """Heap indexes of a string column (memory-mapped)."""
+        return self._map(f"{col}.codes")
+
+    def values(self, col: str) -> np.ndarray:
+        """Distinct strings of a string column, in heap order (decoded once)."""
+        if col not in self._uniq:
+            raw, offsets = self._map(f"{col}.heap").tobytes(), self._map(f"{col}.offsets").tolist()
+            self._uniq[col] = np.array([raw[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])],
+                                       dtype=object)
+        return self._uniq[col]
+
+    def column(self, col: str, rows=None) -> np.ndarray:
+        """One column: the memory map itself for numbers, decoded object array for
+        strings; rows (indexes or mask) restricts it to those rows."""
+        kind = self.kinds.get(col)
+        if kind is None:
+            raise KeyError(f"no column '{col}' in {self.path}")
+        if kind == "s":
+            codes = self.codes(col)
+            return self.values(col)[codes if rows is None else codes[rows]]
+        arr = self._map(col)
+        return arr if rows is None else arr[rows]
+
+    def frame(self, columns=None, rows=None) -> pd.DataFrame:
+        """DataFrame of some columns (all by default) — the scored frame it was written from."""
+        return pd.DataFrame({c: self.column(c, rows) for c in (columns or self.columns)})
+
+    def tier_codes(self, lab: str) -> np.ndarray:
+        """tier_<lab> as 0..3 for A/B/C/U."""
+        col = f"tier_{lab}"
+        lut = np.array(["ABCU".index(v) for v in self.values(col)], dtype=np.int8)
+        return lut[self.codes(col)]
+
+    # ---------- derived tables ----------
+    def summary(self) -> pd.DataFrame:
+        from aix_builder import summary_from_counts
+        counts = {}
+        for lab in self.labels:
+            n = np.bincount(self.tier_codes(lab), minlength=4)
+            counts[lab] = dict(zip("ABCU", n.tolist()))
+        return summary_from_counts(self.labels, counts)
+
+    def top(self, topn=20, tier="A") -> pd.DataFrame:
+        """Top-N per scenario, same rows and order as top_by_tier on the scored frame;
+        only the selected rows are decoded."""
+        from aix_builder import TOP_RENAME, top_frame
+        from aix_core import rank_keys, top_n
+        labs = self.labels
+        if not len(self) or not labs:
+            return top_frame(pd.DataFrame(), labs, [], [], [])
+        codes = np.column_stack([self.tier_codes(lab) for lab in labs])
+        eligible = (codes != 3) if tier == "any" else (codes == "ABC".index(tier))
+        aix = np.column_stack([np.asarray(self.column(f"aix_{lab}"), dtype=np.float64) for lab in labs])
+        keys = rank_keys(aix, np.asarray(self.column("cheque_max"), dtype=np.float64),
+                         np.asarray(self.column("sf")), np.asarray(self.column("fc")), eligible)
+        rows, cols, rank = top_n(keys, topn)
+        picked, local = np.unique(rows, return_inverse=True)
+        sub = self.frame(list(TOP_RENAME) + [f"aix_{lab}" for lab in labs], rows=picked)
+        return top_frame(sub, labs, local, cols, rank)
+
+# ---------- CLI ----------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Read an AIx snapshot (columns, Top-N, summary) without the CSV")
+    p.add_argument("snapshot", help="Path to a .aixsnap directory")
+    p.add_argument("--columns", default=None, help="Comma-separated columns to export, e.g. 'name,aix_700k,tier_700k'")
+    p.add_argument("--top", type=int, default=None, help="Top-N per scenario")
+    p.add_argument("--top-tier", default="A", choices=["A","B","C","any"])
+    p.add_argument("--summary", action="store_true", help="A/B/C/U counts per scenario")
+    p.add_argument("--out", default=None, help="CSV output (default: stdout)")
+    args = p.parse_args(argv)
+
+    snap = Snapshot(args.snapshot)
+    if args.top:
+        df = snap.top(args.top, args.top_tier)
+    elif args.summary:
+        df = snap.summary()
+    elif args.columns:
+        df = snap.frame([c.strip() for c in args.columns.split(",") if c.strip()])
+    else:
+        print(f"{snap.path}: {snap.manifest['country']} · {len(snap)} rows · scenarios {', '.join(snap.labels)}")
+        print("columns:", ", ".join(f"{c} ({k})" for c, k in snap.kinds.items()))
+        return
+    if args.out:
+        df.to_csv(args.out, index=False)
+        print(f"[Snapshot] wrote {len(df)} rows -> {args.out}")
+    else:
+        print(df.to_csv(index=False), end="")
+
+if __name__ == "__main__":
+    main()
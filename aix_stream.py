@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# AIx — streaming build for inputs too large to hold in memory
+# Reads the CSV in bounded chunks, appends the full-output CSV chunk by chunk and
+# keeps only running state per country: one bounded Top-N heap per scenario and
+# tier counters. Outputs are byte-identical to the in-memory path (build_scores +
+# write_outputs), including the int-vs-float formatting of the nullable columns:
+# until the first Tier U row shows up both renderings are written, then the int
+# one is dropped (pandas writes ints only when no row is unscored).
+
+import heapq, os
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aix_builder import (TOP_COLUMNS, TOP_RENAME, get_country, iter_investors, is_nullable, score_country,
+                         label_for, report_issues, summary_from_counts)
+
+# ---------- per-country state ----------
+def stream_open(code: str, targets, full_out, agg_out, summary_out, topn=20, types=None, tier="A") -> dict:
+    table = get_country(code)
+    targets = tuple(targets or table["targets"])
+    full_out = Path(full_out)
+    return {
+        "code": code, "targets": targets, "types": types, "topn": topn, "tier": tier,
+        "labs": [label_for(t) for t in targets],
+        "paths": (full_out, Path(agg_out), Path(summary_out)),
+        "as_float": open(full_out.with_name(full_out.name + ".float.tmp"), "w", newline="", encoding="utf-8"),
+        "as_int": open(full_out.with_name(full_out.name + ".int.tmp"), "w", newline="", encoding="utf-8"),
+        "seen_u": False, "header": True, "rows": 0,
+        "heaps": {lab: [] for lab in (label_for(t) for t in targets)},
+        "counts": {lab: Counter() for lab in (label_for(t) for t in targets)},
+    }
+
+def stream_feed(state: dict, inv: dict) -> None:
+    """Score one parsed chunk for the state's country and fold it into the outputs."""
+    df = score_country(inv, state["code"], state["targets"], types=state["types"])
+    if df.empty and not state["header"]:
+        return
+    chunk_u = bool((df["status"] != "scored").any())
+
+    as_float = df.astype({c: np.float64 for c in df.columns if is_nullable(c)})
+    as_float.to_csv(state["as_float"], index=False, header=state["header"])
+    if not state["seen_u"]:
+        if chunk_u:
+            state["seen_u"] = True
+            state["as_int"].close(); os.unlink(state["as_int"].name); state["as_int"] = None
+        else:
+            df.to_csv(state["as_int"], index=False, header=state["header"])
+    state["header"] = False
+
+    # running Top-N (AIx, cheque_max, SF, FC desc; earlier row first on ties) and tier counts
+    base = state["rows"]; state["rows"] += len(df)
+    cmax, sf, fc = df["cheque_max"].to_numpy(), df["sf"].to_numpy(), df["fc"].to_numpy()
+    for lab in state["labs"]:
+        tiers = df[f"tier_{lab}"].to_numpy()
+        state["counts"][lab].update(tiers.tolist())
+        aix = df[f"aix_{lab}"].to_numpy()
+        heap, topn = state["heaps"][lab], state["topn"]
+        ranked = (tiers != "U") if state["tier"] == "any" else (tiers == state["tier"])
+        for i in np.flatnonzero(ranked):
+            key = (aix[i], cmax[i], sf[i], fc[i], -(base + i))
+            item = (key, [df[k].iat[i] for k in TOP_RENAME] + [aix[i]])
+            if len(heap) < topn:
+                heapq.heappush(heap, item)
+            elif key > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+def stream_close(state: dict) -> tuple:
+    """Finish the full output and write Top-N + summary -> (top_rows, summary_rows)."""
+    full_out, agg_out, summary_out = state["paths"]
+    state["as_float"].close()
+    if state["seen_u"]:
+        os.replace(state["as_float"].name, full_out)
+    else:
+        state["as_int"].close()
+        os.replace(state["as_int"].name, full_out); os.unlink(state["as_float"].name)
+
+    num = np.float64 if state["seen_u"] else np.int64
+    rows = []
+    for lab in state["labs"]:
+        ranked = sorted(state["heaps"][lab], key=lambda it: it[0], reverse=True)
+        rows += [[lab, r] + vals for r, (_, vals) in enumerate(ranked, 1)]
+    if rows:
+        top = pd.DataFrame(rows, columns=TOP_COLUMNS)
+        top = top.astype({"min_check": num, "max_check": num, "aix": num})
+    else:
+        top = pd.DataFrame(columns=TOP_COLUMNS)
+    top.to_csv(agg_out, index=False)
+    print(f"[Top-20] wrote {len(top)} rows -> {agg_out}")
+
+    summary = summary_from_counts(state["labs"], state["counts"])
+    summary.to_csv(summary_out, index=False)
+    print(f"[Summary] wrote {len(summary)} rows -> {summary_out}")
+    return len(top), len(summary)
+
+# ---------- driver ----------
+def stream_build(path, outputs: dict, targets=None, topn=20, chunk_rows=50_000, tier="A") -> None:
+    """One chunked pass over the CSV for several countries.
+
+    outputs: {code: (full_out, agg_out, summary_out)}
+    """
+    states = [stream_open(code, targets, *paths, topn=topn, tier=tier) for code, paths in outputs.items()]
+    types = set().union(*(get_country(s["code"])["types"] for s in states))
+    issues = {}                                    # cheque issues of every chunk, reported once
+    try:
+        for chunk in iter_investors(path, types=types, chunk_rows=chunk_rows, issues=issues):
+            for s in states:
+                stream_feed(s, chunk)
+    except BaseException:
+        for s in states:
+            for f in (s["as_float"], s["as_int"]):
+                if f is not None:
+                    f.close(); Path(f.name).unlink(missing_ok=True)
+        raise
+    report_issues(issues)
+    for s in states:
+        stream_close(s)
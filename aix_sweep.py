@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# AIx — dense scenario sweeps and per-fund Tier A round-size intervals
+#
+# For one fund, AC(T) is flat (30, or the 15 cap) up to T = max cheque and then
+# decreasing, and FS(T) first rises then falls: AC+FS (hence AIx) is unimodal in T,
+# so the set of targets where the fund is Tier A is one interval [a_from, a_to].
+# tier_a_intervals() solves it in closed form from the linear pieces:
+#   rint(AC) >= a  <=>  T <= 30·max / (a - 0.5)                          (a >= 1)
+#   rint(FS) >= f  <=>  min/(1.1 - q/2) <= T <= min(2(max-min)/q, max/(0.6 + q/2))
+#                       with q = (f - 0.5) / 25                           (f >= 1)
+# then snaps the bounds to whole currency units, checking them against score_grid
+# so that rounding ties land exactly where the evaluated grid puts them.
+# tier_transitions() uses the same level sets for every AIx step: rint(AC) and rint(FS)
+# only change where T crosses 30·max/(a - 0.5) or an FS bound above, so AIx(T) is a
+# step function with at most 80 breakpoints per fund; each is snapped to whole units
+# the same way and the steps are read back from score_grid.
+
+import numpy as np
+
+from aix_core import score_grid, TIER_LABELS
+
+AC_MAX, FS_MAX = 30, 25
+
+# ---------- long layout ----------
+def sweep_long(base: dict, targets) -> dict:
+    """AIx of every scored fund at every target, as long columns
+    (fund, target, ac, fs, aix, tier). Tier U funds are left out: they are U everywhere."""
+    min_c = np.asarray(base["cheque_min"], dtype=np.int64)
+    max_c = np.asarray(base["cheque_max"], dtype=np.int64)
+    scored = np.flatnonzero((min_c > 0) | (max_c > 0))
+    col = lambda k: np.asarray(base[k], dtype=np.int64)[scored, None]
+    t = np.asarray(targets, dtype=np.int64)
+    g = score_grid(col("cheque_min"), col("cheque_max"), col("sf"), col("fc"), col("malus"),
+                   t.astype(np.float64)[None, :])
+    k = len(t)
+    return {
+        "fund": np.repeat(scored, k),
+        "target": np.tile(t, len(scored)),
+        "ac": g["ac"].astype(np.int16).ravel(),
+        "fs": g["fs"].astype(np.int16).ravel(),
+        "aix": g["aix"].astype(np.int16).ravel(),
+        "tier": TIER_LABELS[g["codes"]].ravel(),
+    }
+
+# ---------- Tier A intervals ----------
+def _min_sum_for_a(sf, fc, malus, cut=75):
+    """Smallest AC+FS (0..55) giving AIx >= cut, or 56 when unreachable."""
+    s = np.arange(AC_MAX + FS_MAX + 1)[None, :]
+    aix = np.clip(np.rint((s + sf[:, None] + fc[:, None]) * (100.0 / 90.0)) + malus[:, None], 0, 100)
+    ok = aix >= cut
+    return np.where(ok.any(axis=1), ok.argmax(axis=1), AC_MAX + FS_MAX + 1)
+
+def _is_a(min_c, max_c, sf, fc, malus, t):
+    g = score_grid(min_c, max_c, sf, fc, malus, np.asarray(t, dtype=np.float64))
+    return (g["codes"] == 0) & (t >= 1)
+
+def tier_a_intervals(min_c, max_c, sf, fc, malus, cut=75) -> tuple:
+    """Per fund, the inclusive whole-unit target range where it is Tier A.
+
+    Returns (a_from, a_to) int64 arrays; funds never Tier A get a_from = a_to = -1.
+    """
+    min_c = np.asarray(min_c, dtype=np.int64); max_c = np.asarray(max_c, dtype=np.int64)
+    sf = np.asarray(sf, dtype=np.int64); fc = np.asarray(fc, dtype=np.int64)
+    malus = np.asarray(malus, dtype=np.int64)
+    need = _min_sum_for_a(sf, fc, malus, cut)
+
+    m, M = min_c[:, None].astype(np.float64), max_c[:, None].astype(np.float64)
+    a = np.arange(AC_MAX + 1)[None, :]                      # AC value taken from rint(AC) >= a
+    f = need[:, None] - a                                   # FS still needed
+    ac_cap = np.where(sf < 20, 15, AC_MAX)[:, None]
+    fs_ok = ((min_c > 0) & (max_c > 0) & (max_c >= min_c))[:, None]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # {rint(AC) >= a} = (0, hi_ac]
+        hi_ac = np.where(a <= 0, np.inf, 30.0 * M / (a - 0.5))
+        feasible = (a <= ac_cap) & ((a <= 0) | (M > 0))
+        # {rint(FS) >= f} = [lo_fs, hi_fs]
+        q = (f - 0.5) / FS_MAX
+        lo_fs = np.where(f <= 0, 0.0, m / (1.1 - 0.5 * q))
+        hi_fs = np.where(f <= 0, np.inf, np.minimum(2.0 * (M - m) / q, M / (0.6 + 0.5 * q)))
+        feasible &= (f <= FS_MAX) & ((f <= 0) | fs_ok)
+
+    lo = np.where(feasible, lo_fs, np.inf)
+    hi = np.where(feasible, np.minimum(hi_ac, hi_fs), -np.inf)
+    feasible &= lo <= hi
+    lo = np.where(feasible, lo, np.inf).min(axis=1)
+    hi = np.where(feasible, hi, -np.inf).max(axis=1)
+    has = np.isfinite(lo) & np.isfinite(hi)
+
+    # snap to whole units, then walk each bound onto the exact grid boundary
+    lo_i = np.where(has, np.maximum(np.ceil(np.where(has, lo, 1)), 1), 1).astype(np.int64)
+    hi_i = np.where(has, np.floor(np.where(has, hi, 1)), 1).astype(np.int64)
+    args = (min_c, max_c, sf, fc, malus)
+    for _ in range(64):
+        down = has & _is_a(*args, lo_i - 1)                 # boundary further left
+        up = has & ~_is_a(*args, lo_i) & (lo_i <= hi_i)     # float slack on the right
+        if not (down.any() or up.any()):
+            break
+        lo_i = np.where(down, lo_i - 1, np.where(up, lo_i + 1, lo_i))
+    for _ in range(64):
+        right = has & _is_a(*args, hi_i + 1)
+        left = has & ~_is_a(*args, hi_i) & (hi_i >= lo_i)
+        if not (right.any() or left.any()):
+            break
+        hi_i = np.where(right, hi_i + 1, np.where(left, hi_i - 1, hi_i))
+
+    has &= (lo_i <= hi_i) & _is_a(*args, lo_i)
+    return np.where(has, lo_i, -1), np.where(has, hi_i, -1)
+
+# ---------- all-tier transitions ----------
+_TRANSITION_CHUNK = 4096                                    # funds per score_grid batch
+T_BITS = 40                                                 # targets below 2**40 (~1.1e12)
+
+def _breakpoints(min_c, max_c) -> np.ndarray:
+    """(n, 80) real targets where rint(AC) or rint(FS) may change (NaN = none)."""
+    m, M = min_c[:, None].astype(np.float64), max_c[:, None].astype(np.float64)
+    a = np.arange(1, AC_MAX + 1)[None, :]
+    q = (np.arange(1, FS_MAX + 1)[None, :] - 0.5) / FS_MAX
+    fs_ok = ((min_c > 0) & (max_c > 0) & (max_c >= min_c))[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ac = np.where(M > 0, 30.0 * M / (a - 0.5), np.nan)
+        lo_fs = np.where(fs_ok, m / (1.1 - 0.5 * q), np.nan)
+        hi_fs = np.where(fs_ok, np.minimum(2.0 * (M - m) / q, M / (0.6 + 0.5 * q)), np.nan)
+    return np.concatenate([ac, lo_fs, hi_fs], axis=1)
+
+def tier_transitions(min_c, max_c, sf, fc, malus) -> tuple:
+    """Per fund, the whole-unit targets where its AIx changes, as one flat run per fund.
+
+    Returns (ptr, start, aix, code): fund i owns entries ptr[i]:ptr[i+1]; start is sorted
+    within a fund and starts at 1, so the fund's AIx / tier code at T is that of the last
+    entry with start <= T. Tier U funds get one entry (aix -1, code 3).
+    """
+    min_c = np.asarray(min_c, dtype=np.int64); max_c = np.asarray(max_c, dtype=np.int64)
+    sf = np.asarray(sf, dtype=np.int64); fc = np.asarray(fc, dtype=np.int64)
+    malus = np.asarray(malus, dtype=np.int64)
+    n, top = len(min_c), (1 << T_BITS) - 1
+    counts, starts, aixs, codes = np.zeros(n, dtype=np.int64), [], [], []
+    for lo in range(0, n, _TRANSITION_CHUNK):
+        sl = slice(lo, lo + _TRANSITION_CHUNK)
+        x = np.floor(_breakpoints(min_c[sl], max_c[sl]))
+        # float slack: the step sits within one unit of floor(x)
+        cand = (x[:, :, None] + np.arange(-1, 3)).reshape(len(x), -1)
+        cand = np.clip(np.nan_to_num(cand, nan=1.0, posinf=top), 1, top).astype(np.int64)
+        cand = np.sort(np.concatenate([np.ones((len(x), 1), dtype=np.int64), cand], axis=1), axis=1)
+        g = score_grid(min_c[sl, None], max_c[sl, None], sf[sl, None], fc[sl, None], malus[sl, None],
+                       cand.astype(np.float64))
+        aix = np.nan_to_num(g["aix"], nan=-1.0).astype(np.int16)
+        keep = np.ones(cand.shape, dtype=bool)
+        keep[:, 1:] = aix[:, 1:] != aix[:, :-1]
+        counts[sl] = keep.sum(axis=1)
+        starts.append(cand[keep]); aixs.append(aix[keep]); codes.append(g["codes"][keep].astype(np.int8))
+    ptr = np.zeros(n + 1, dtype=np.int64); ptr[1:] = np.cumsum(counts)
+    cat = lambda parts, dt: np.concatenate(parts) if parts else np.empty(0, dtype=dt)
+    return ptr, cat(starts, np.int64), cat(aixs, np.int16), cat(codes, np.int8)
+
+def anchors_covering(a_from, a_to, lo: int, hi: int) -> np.ndarray:
+    """Indexes of funds that stay Tier A for every target in [lo, hi]."""
+    a_from, a_to = np.asarray(a_from), np.asarray(a_to)
+    return np.flatnonzero((a_from >= 0) & (a_from <= lo) & (a_to >= hi))
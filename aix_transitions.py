@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# AIx — per-fund tier transition index: any round size after one build (--transitions)
+# AIx(T) of a fund is a step function of the target (aix_sweep.tier_transitions): the
+# index stores, once per country, every fund's steps as flat arrays
+#   ptr      fund i owns entries ptr[i]:ptr[i+1]
+#   start    whole-unit target where the entry starts (first one = 1)
+#   aix      AIx from there on (-1 on Tier U funds), code tier 0..3 for A/B/C/U
+# plus the fund columns of the Top-N table. Queries, for any target T:
+#   at(T)       every fund's AIx and tier — one binary search on (fund, start) keys
+#   counts(T)   A/B/C/U counts — one binary search in the prefix sums of the tier
+#               changes (+1 new tier, -1 old tier at each step)
+#   top(T)      Top-N as top_by_tier would build it for a build at T
+# Saved next to the full output as <full stem>.aixtrans.npz (strings as codes + heap).
+# Usage: python aix_transitions.py out/aix_france_v4.aixtrans.npz --targets 650k,975k --summary
+
+import argparse, os, sys
+from pathlib import Path
+
+import numpy as np
+
+from aix_cache import _encode_strings, _decode_strings
+from aix_core import rank_keys, top_n
+from aix_sweep import tier_transitions, T_BITS
+from aix_builder import (TOP_COLUMNS, TOP_RENAME, column, label_for, n_rows, parse_targets, summary_rows,
+                         top_table, write_csv)
+
+SUFFIX = ".aixtrans.npz"
+VERSION = 1
+STEP_COLUMNS = ["ptr", "start", "aix", "code"]
+
+def transitions_path(full_out) -> Path:
+    """aix_france_v4.csv -> aix_france_v4.aixtrans.npz"""
+    return Path(full_out).with_suffix(SUFFIX)
+
+class TransitionIndex:
+    """Tier transitions of one scored country (see module header)."""
+
+    def __init__(self, steps: dict, funds: dict, code=None):
+        self.ptr, self.start, self.aix, self.code = (steps[k] for k in STEP_COLUMNS)
+        self.funds, self.country = funds, code
+        self.n = len(self.ptr) - 1
+        fund = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.ptr))
+        self.keys = (fund << T_BITS) | self.start                  # sorted: fund-major, then start
+
+        # tier count changes, in target order; counts before any = every fund's first step
+        later = np.ones(len(self.start), dtype=bool); later[self.ptr[:-1]] = False
+        self.base = np.bincount(self.code[self.ptr[:-1]], minlength=4).astype(np.int64)
+        at = np.flatnonzero(later)
+        order = np.argsort(self.start[at], kind="stable")
+        at = at[order]
+        delta = np.zeros((len(at), 4), dtype=np.int64)
+        np.add.at(delta, (np.arange(len(at)), self.code[at]), 1)
+        np.add.at(delta, (np.arange(len(at)), self.code[at - 1]), -1)
+        self.event_t, self.event_counts = self.start[at], np.cumsum(delta, axis=0)
+
+    @classmethod
+    def from_table(cls, table, code=None) -> "TransitionIndex":
+        """Index of a scored frame or score_table dict (full-output columns)."""
+        num = lambda c: np.nan_to_num(column(table, c, np.float64), nan=0.0).astype(np.int64)
+        steps = dict(zip(STEP_COLUMNS, tier_transitions(num("cheque_min"), num("cheque_max"), num("sf"),
+                                                        num("fc"), num("malus"))))
+        funds = {c: column(table, c) for c in list(TOP_RENAME) + ["sf", "fc"]}
+        return cls(steps, funds, code)
+
+    # ---------- queries ----------
+    def _target(self, target) -> int:
+        t = int(target)
+        if not 1 <= t < (1 << T_BITS):
+            raise ValueError(f"target {target} out of range")
+        return t
+
+    def at(self, target) -> tuple:
+        """(aix float64 with NaN on Tier U, tier code int8) of every fund at target."""
+        t = self._target(target)
+        i = np.searchsorted(self.keys, (np.arange(self.n, dtype=np.int64) << T_BITS) | t, "right") - 1
+        aix = self.aix[i].astype(np.float64)
+        aix[self.code[i] == 3] = np.nan
+        return aix, self.code[i]
+
+    def counts(self, target) -> dict:
+        """{tier: count} at target."""
+        e = np.searchsorted(self.event_t, self._target(target), "right")
+        c = self.base + (self.event_counts[e - 1] if e else 0)
+        return dict(zip("ABCU", c.tolist()))
+
+    def top(self, target, topn=20, tier="A") -> dict:
+        """Top-N table at target, same rows and bytes as write_outputs for a build at it."""
+        aix, code = self.at(target)
+        eligible = (code != 3) if tier == "any" else (code == "ABC".index(tier))
+        keys = rank_keys(aix[:, None], column(self.funds, "cheque_max", np.float64), self.funds["sf"],
+                         self.funds["fc"], eligible[:, None])
+        rows, cols, rank = top_n(keys, topn)
+        lab = label_for(target)
+        aix_col = aix if np.isnan(aix).any() else aix.astype(np.int64)
+        return top_table({**self.funds, f"aix_{lab}": aix_col}, [lab], rows, cols, rank)
+
+    # ---------- storage ----------
+    def save(self, path) -> Path:
+        """Write the index as one .npz, atomically (tmp file + rename)."""
+        path = Path(path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp.npz")
+        arrays = {f"step_{k}": getattr(self, k) for k in STEP_COLUMNS}
+        for c, v in self.funds.items():
+            if v.dtype == object:
+                arrays[f"s_{c}.codes"], arrays[f"s_{c}.heap"], arrays[f"s_{c}.offsets"] = _encode_strings(v.tolist())
+            else:
+                arrays[f"n_{c}"] = v
+        np.savez(tmp, version=np.int64(VERSION), country=np.str_(self.country or ""), **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "TransitionIndex":
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != VERSION:
+                raise ValueError(f"{path}: unsupported transition index version {int(z['version'])}")
+            steps = {k: z[f"step_{k}"] for k in STEP_COLUMNS}
+            funds = {}
+            for c in list(TOP_RENAME) + ["sf", "fc"]:
+                if f"n_{c}" in z:
+                    funds[c] = z[f"n_{c}"]
+                else:
+                    funds[c] = np.array(_decode_strings(z[f"s_{c}.codes"], z[f"s_{c}.heap"], z[f"s_{c}.offsets"]),
+                                        dtype=object)
+            return cls(steps, funds, str(z["country"]) or None)
+
+    def __len__(self):
+        return self.n
+
+# ---------- CLI ----------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Tier counts / Top-N at any round size from a transition index")
+    p.add_argument("index", help=f"{SUFFIX} file written by aix_builder.py --transitions")
+    p.add_argument("--targets", required=True, help="Round sizes, e.g. '650k,975k,2.2M'")
+    p.add_argument("--summary", action="store_true", help="A/B/C/U counts and % per target (default)")
+    p.add_argument("--top", type=int, default=None, help="Top-N per target")
+    p.add_argument("--top-tier", default="A", choices=["A","B","C","any"])
+    p.add_argument("--out", default=None, help="CSV output (default: stdout)")
+    args = p.parse_args(argv)
+
+    idx = TransitionIndex.load(args.index)
+    targets = parse_targets(args.targets, default=())
+    if not targets:
+        p.error(f"no target in '{args.targets}'")
+    if args.top:
+        parts = [idx.top(t, args.top, args.top_tier) for t in targets]
+        table = {c: np.concatenate([np.asarray(x[c], dtype=object) for x in parts]) for c in TOP_COLUMNS}
+    else:
+        labs = [label_for(t) for t in targets]
+        rows = summary_rows(labs, {lab: idx.counts(t) for lab, t in zip(labs, targets)})
+        table = {k: [r[k] for r in rows] for k in ("scenario", "tier", "count", "percent")}
+    write_csv(table, args.out or sys.stdout)
+    if args.out:
+        print(f"[Transitions] wrote {n_rows(table)} rows ({len(targets)} targets, {len(idx)} funds) -> {args.out}")
+
+if __name__ == "__main__":
+    main()
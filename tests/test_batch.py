@@ -0,0 +1,25 @@
+# Batch reports match single builds at each request's target.
+import json
+from pathlib import Path
+
+import aix_builder
+from aix_batch import batch_build
+from aix_builder import output_paths
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def test_targets_sharing_a_label(tmp_path):
+    reqs = [{"id": "a", "country": "CH", "target": 399_500}, {"id": "b", "country": "CH", "target": 400_499},
+            {"id": "c", "country": "CH", "target": "1.2M"}]                           # a, b: both '400k'
+    reqs = [{**r, "topn": 400, "tier": "any"} for r in reqs]
+    (tmp_path / "req.jsonl").write_text("".join(json.dumps(r) + "\n" for r in reqs))
+    cache = str(tmp_path / ".aix_cache")
+    manifest = batch_build(tmp_path / "req.jsonl", tmp_path / "batch", ROOT / "OpenVC.csv", cache_dir=cache)
+    assert [m["status"] for m in manifest] == ["ok"] * 3
+    for r, m in zip(reqs, manifest):
+        out = tmp_path / f"single_{r['id']}"
+        aix_builder.main(["--input", str(ROOT / "OpenVC.csv"), "--countries", "CH", "--targets", str(r["target"]),
+                          "--topn", "400", "--top-tier", "any", "--out", str(out), "--cache-dir", cache])
+        _, agg, summary = output_paths("CH", out)
+        assert Path(m["top_out"]).read_bytes() == agg.read_bytes(), r["id"]
+        assert Path(m["summary_out"]).read_bytes() == summary.read_bytes(), r["id"]
@@ -0,0 +1,98 @@
+# Every build mode writes the same bytes as the default in-memory build (FR + CH).
+import csv, filecmp, shutil
+from pathlib import Path
+
+import pytest
+
+import aix_builder
+import aix_builder_sw
+from aix_bench import synth_openvc
+from aix_builder import output_paths, write_csv
+from aix_countries import COUNTRIES as COUNTRY_TABLES
+from aix_snapshot import Snapshot, snapshot_path
+
+ROOT = Path(__file__).resolve().parents[1]
+COUNTRIES = ["FR", "CH"]
+
+@pytest.fixture(scope="module", params=["openvc", "synthetic"])
+def dataset(request, tmp_path_factory):
+    if request.param == "openvc":
+        return ROOT / "OpenVC.csv"
+    return synth_openvc(tmp_path_factory.mktemp("data") / "synth.csv", 3000, seed=1)
+
+def build(csv_path, out, *extra):
+    aix_builder.main(["--input", str(csv_path), "--countries", ",".join(COUNTRIES), "--out", str(out),
+                      "--cache-dir", str(Path(out) / ".aix_cache"), *extra])
+    return [p for c in COUNTRIES for p in output_paths(c, out)]
+
+@pytest.fixture(scope="module")
+def reference(dataset, tmp_path_factory):
+    return build(dataset, tmp_path_factory.mktemp("default"))
+
+@pytest.mark.parametrize("extra", [["--no-cache"], ["--stream", "--chunk-rows", "700"], ["--workers", "2"],
+                                   ["--incremental"]], ids=["no-cache", "stream", "workers", "incremental"])
+def test_mode_matches_default(dataset, reference, tmp_path, extra):
+    for got, ref in zip(build(dataset, tmp_path, *extra), reference):
+        assert filecmp.cmp(got, ref, shallow=False), got.name
+
+def test_incremental_rerun_matches_default(dataset, reference, tmp_path):
+    build(dataset, tmp_path, "--incremental")
+    for got, ref in zip(build(dataset, tmp_path, "--incremental"), reference):
+        assert filecmp.cmp(got, ref, shallow=False), got.name
+
+def test_incremental_after_edit_matches_default(dataset, tmp_path):
+    src = tmp_path / "input.csv"
+    shutil.copy(dataset, src)
+    build(src, tmp_path / "inc", "--incremental")
+    with open(src, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    paris = [i for i, r in enumerate(rows) if i and "Paris" in r[2] and r[6].lower() == "vc"]
+    rows[paris[0]][8] = "$9,000,000"                                           # updated fund
+    del rows[paris[1]]                                                         # removed fund
+    with open(src, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    reference = build(src, tmp_path / "ref")
+    for got, ref in zip(build(src, tmp_path / "inc", "--incremental"), reference):
+        assert filecmp.cmp(got, ref, shallow=False), got.name
+
+def test_incremental_after_country_edit_matches_default(dataset, tmp_path, monkeypatch):
+    build(dataset, tmp_path / "inc", "--incremental")
+    ch = {k: v for k, v in COUNTRY_TABLES["CH"].items() if not k.startswith("_")}
+    monkeypatch.setitem(COUNTRY_TABLES, "CH", {**ch, "aliases": ch["aliases"][:3], "preseed": ["prototype"]})
+    reference = build(dataset, tmp_path / "ref")
+    for got, ref in zip(build(dataset, tmp_path / "inc", "--incremental"), reference):
+        assert filecmp.cmp(got, ref, shallow=False), got.name
+
+def test_snapshot_matches_csv_outputs(dataset, reference, tmp_path):
+    build(dataset, tmp_path, "--snapshot")
+    for i, code in enumerate(COUNTRIES):
+        full, agg, summary = reference[3 * i:3 * i + 3]
+        snap = Snapshot(snapshot_path(output_paths(code, tmp_path)[0]))
+        for table, ref in ((snap.frame(), full), (snap.top(20), agg), (snap.summary(), summary)):
+            out = tmp_path / f"snap_{ref.name}"
+            write_csv(table, out)
+            assert out.read_bytes() == ref.read_bytes(), ref.name
+
+@pytest.mark.parametrize("extra", [["--stream", "--chunk-rows", "700"], ["--workers", "2"]], ids=["stream", "workers"])
+def test_mode_reports_parse_issues_once(tmp_path, capfd, extra):
+    src = tmp_path / "input.csv"
+    with open(ROOT / "OpenVC.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    vc = [i for i, r in enumerate(rows) if i and r[6].lower() == "vc"]
+    rows[vc[0]][8], rows[vc[len(vc) // 2]][7], rows[vc[-1]][8] = "ask us", "tbd", "ask us"   # far-apart rows
+    with open(src, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    parse_lines = lambda: [l for l in capfd.readouterr().out.splitlines() if l.startswith("[Parse]")]
+    build(src, tmp_path / "ref", "--no-cache")
+    reference = parse_lines()
+    build(src, tmp_path / "mode", *extra)
+    assert reference == ["[Parse] 3 cheque cells unparseable (2 distinct, e.g. 'tbd') -> counted as missing"]
+    assert parse_lines() == reference
+
+def test_single_country_front_end_names_outputs(tmp_path, monkeypatch):
+    src = synth_openvc(tmp_path / "synth.csv", 300, seed=2)
+    monkeypatch.chdir(tmp_path)
+    aix_builder_sw.main(["--input", str(src), "--country", "fr", "--no-cache"])
+    assert all(p.exists() for p in output_paths("FR")) and not output_paths("CH")[0].exists()
+    with pytest.raises(SystemExit):
+        aix_builder_sw.main(["--input", str(src), "--country", "XX"])
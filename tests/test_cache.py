@@ -0,0 +1,41 @@
+# aix_cache entries: per-path eviction, cached codes and parse issues.
+import csv, shutil
+from pathlib import Path
+
+import pytest
+
+from aix_builder import load_investors, read_investors, select_country
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def with_bad_cheques(src, dst):
+    with open(src, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    rows[1][8], rows[2][8] = "ask us", "nan"
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with open(dst, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return dst
+
+def test_same_named_exports_keep_their_entries(tmp_path):
+    a, b = tmp_path / "a" / "OpenVC.csv", with_bad_cheques(ROOT / "OpenVC.csv", tmp_path / "b" / "OpenVC.csv")
+    a.parent.mkdir(); shutil.copy(ROOT / "OpenVC.csv", a)
+    cache = tmp_path / "cache"
+    load_investors(a, cache_dir=cache); load_investors(b, cache_dir=cache)
+    entries = sorted(cache.glob("*.npz"))
+    assert len(entries) == 2
+    load_investors(a, cache_dir=cache); load_investors(b, cache_dir=cache)
+    assert sorted(cache.glob("*.npz")) == entries                   # both hit, nothing rewritten
+
+def test_parse_issues_reported_on_a_hit(tmp_path, capsys):
+    src = with_bad_cheques(ROOT / "OpenVC.csv", tmp_path / "OpenVC.csv")
+    load_investors(src, cache_dir=tmp_path / "cache")
+    miss = capsys.readouterr().out
+    load_investors(src, cache_dir=tmp_path / "cache")
+    assert "[Parse] 2 cheque cells unparseable" in miss and capsys.readouterr().out == miss
+
+@pytest.mark.parametrize("code", ["FR", "CH"])
+def test_cached_codes_select_the_same_rows(tmp_path, code):
+    cached = load_investors(ROOT / "OpenVC.csv", types={"vc", "cvc"}, cache_dir=tmp_path / "cache")
+    assert "stage_mask" in cached and "type_code" in cached
+    assert select_country(cached, code) == select_country(read_investors(ROOT / "OpenVC.csv", {"vc", "cvc"}), code)
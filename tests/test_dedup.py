@@ -0,0 +1,54 @@
+# Regression cases for aix_dedup: funds sharing a parent site must stay apart.
+from aix_builder import INVESTOR_FIELDS
+from aix_dedup import dedup_investors, norm_path
+
+def table(*records):
+    inv = {k: [] for k in INVESTOR_FIELDS}
+    for name, website, lo, hi in records:
+        rec = {"name": name, "website": website, "type": "vc", "hq_raw": "Paris, France", "countries_raw": "France",
+               "stage_raw": "2. Prototype", "cheque_min": lo, "cheque_max": hi, "confidence": "high", "malus": 0}
+        for k in INVESTOR_FIELDS:
+            inv[k].append(rec[k])
+    return inv
+
+def clusters(inv):
+    out, _ = dedup_investors(inv)
+    return sorted(out["dup_count"], reverse=True)
+
+def test_norm_path():
+    assert norm_path("https://sapphireventures.com/funds/sapphire-sport/") == "funds/sapphire-sport"
+    assert norm_path("http://www.earlybird.com/?ref=x") == ""
+
+def test_distinct_funds_of_one_site_are_kept():
+    inv = table(("Sapphire Ventures", "https://sapphireventures.com/funds/sapphire-ventures/", 10_000_000, 60_000_000),
+                ("Sapphire Sport", "https://sapphireventures.com/funds/sapphire-sport/", 3_000_000, 7_000_000),
+                ("Earlybird Ventures - Digital East Fund", "https://earlybird.com/", 500_000, 10_000_000),
+                ("Earlybird Ventures - Digital West Fund", "http://earlybird.com/", 500_000, 10_000_000))
+    assert clusters(inv) == [1, 1, 1, 1]
+
+def test_disjoint_cheque_ranges_are_not_merged():
+    inv = table(("Lakestar", "https://lakestar.com/", 100_000, 500_000),
+                ("Lakestar", "https://lakestar.com/", 5_000_000, 20_000_000))
+    assert clusters(inv) == [1, 1]
+
+def test_duplicates_are_merged():
+    inv = table(("Osage University Partners", "https://oup.vc/", 5_000_000, 20_000_000),
+                ("OUP Osage University Partners", "https://oup.vc/", 0, 0),
+                ("Realist Ventures", "https://www.realistventures.com", 100_000, 500_000),
+                ("Realist Ventures", "https://www.realistventures.com/", 0, 0),
+                ("Sapphire Sport", "https://sapphireventures.com/funds/sapphire-sport/", 3_000_000, 7_000_000))
+    out, report = dedup_investors(inv)
+    assert sorted(out["dup_count"], reverse=True) == [2, 2, 1]
+    assert out["cheque_min"][:2] == [5_000_000, 100_000]
+
+def test_conflicts_hold_across_a_cluster():
+    # A-B and B-C pass, A-C does not: A and C must not end up together through B
+    ranges = table(("Alpha Ventures", "https://alpha.vc/", 100_000, 500_000),
+                   ("Alpha Ventures", "", 0, 0),
+                   ("Alpha Ventures", "", 5_000_000, 20_000_000))
+    domains = table(("Alpha Ventures", "https://alpha.vc/", 100_000, 500_000),
+                    ("Alpha Ventures", "", 0, 0),
+                    ("Alpha Ventures", "https://alpha-capital.com/", 100_000, 500_000))
+    for inv in (ranges, domains):
+        out, _ = dedup_investors(inv)
+        assert out["dup_count"] == [2, 1]
@@ -0,0 +1,48 @@
+# score_matrix against the scalar reference helpers (the baseline per-row loop).
+import math
+
+import numpy as np
+import pytest
+
+from aix_builder import assign_tier, is_unscored, score_anchor_capacity, score_flex
+from aix_core import score_matrix
+
+def reference(min_c, max_c, sf, fc, malus, t) -> tuple:
+    """(ac, fs, aix, tier) of one fund at one target, None on Tier U."""
+    missing = lambda v: v is None or (isinstance(v, float) and math.isnan(v))
+    min_c, max_c = (None if missing(v) else v for v in (min_c, max_c))
+    if is_unscored(min_c, max_c):
+        return None, None, None, "U"
+    ac = score_anchor_capacity(max_c, t, sf)
+    fs = score_flex(min_c, max_c, t)
+    aix = max(0, min(100, int(round((ac + fs + sf + fc) * (100.0 / 90.0))) + malus))
+    return ac, fs, aix, assign_tier(aix)
+
+def check(funds, targets):
+    m = score_matrix(*(np.array([f[i] for f in funds], dtype=object if i < 2 else np.int64) for i in range(5)),
+                     targets)
+    for i, f in enumerate(funds):
+        for j, t in enumerate(targets):
+            got = [None if np.isnan(m[k][i, j]) else int(m[k][i, j]) for k in ("ac", "fs", "aix")]
+            assert (*got, m["tier"][i, j]) == reference(*f, t), (f, t)
+
+def test_half_integer_rounding():
+    # ratio * 30 = 2.5 / 3.5 and 25 * overlap / band = 12.5: round half to even, like round()
+    funds = [(0, 25_000, 20, 15, 0), (0, 35_000, 20, 15, 0), (0, 350_000, 20, 15, 0),
+             (100_000, 425_000, 20, 10, -5), (300_000, 500_000, 8, 5, 0), (150_000, 225_000, 0, 0, -10)]
+    check(funds, [300_000, 1_000_000, 500_000])
+
+@pytest.mark.parametrize("missing", [None, float("nan"), 0])
+def test_missing_cheques(missing):
+    funds = [(missing, missing, 20, 15, -10), (missing, 400_000, 20, 15, -5), (200_000, missing, 8, 10, -5)]
+    check(funds, [250_000, 700_000, 1_200_000])
+
+def test_random_funds():
+    rng = np.random.default_rng(3)
+    n = 300
+    mn = rng.integers(0, 2_000, n) * 1_000 * rng.integers(0, 2, n)
+    mx = mn + rng.integers(0, 3_000, n) * 1_000 * rng.integers(0, 2, n)
+    mx = np.where(rng.random(n) < 0.1, rng.integers(0, 1_000, n) * 1_000, mx)   # some max < min
+    funds = list(zip(mn.tolist(), mx.tolist(), rng.choice([0, 8, 20], n).tolist(),
+                     rng.choice([0, 5, 10, 15], n).tolist(), rng.choice([0, -5, -10], n).tolist()))
+    check(funds, [100_000, 250_000, 300_000, 700_000, 1_200_000, 2_500_000])
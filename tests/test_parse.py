@@ -0,0 +1,18 @@
+# Cheque parsing: clean, salvaged and rejected strings.
+import pytest
+
+from aix_builder import _parse_money, parse_money_column
+
+@pytest.mark.parametrize("txt,expected", [
+    ("€250k", (250_000, "ok")), ("1.2m", (1_200_000, "ok")), ("CHF 300 000", (300_000, "ok")),
+    ("", (0, "empty")), ("n/a", (0, "unparseable")),
+    ("nan", (0, "unparseable")), ("NaN", (0, "unparseable")), ("inf", (0, "unparseable")),
+    ("1e999", (0, "unparseable")), ("1e300", (0, "unparseable")),
+])
+def test_parse_money(txt, expected):
+    assert _parse_money(txt) == expected
+
+def test_non_finite_cells_do_not_abort_the_column():
+    values, issues = parse_money_column(["$500k", "nan", "inf", "$500k"])
+    assert values.tolist() == [500_000, 0, 0, 500_000]
+    assert {k: v[1] for k, v in issues.items()} == {"nan": "unparseable", "inf": "unparseable"}
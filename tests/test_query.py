@@ -0,0 +1,34 @@
+# QueryIndex filters against a brute-force scan of the scored table.
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aix_builder import column, load_investors, score_table, select_country
+from aix_query import QueryIndex
+
+ROOT = Path(__file__).resolve().parents[1]
+
+@pytest.fixture(scope="module")
+def scored(tmp_path_factory):
+    inv = load_investors(ROOT / "OpenVC.csv", cache_dir=tmp_path_factory.mktemp("cache"))
+    table = score_table(select_country(inv, "CH"), "CH", [300_000, 800_000])
+    return table, QueryIndex(table)
+
+@pytest.mark.parametrize("col", ["cheque_min", "cheque_max"])
+@pytest.mark.parametrize("lo,hi", [(None, 100_000), (None, 500_000), (250_000, 1_000_000), (1_000_000, None),
+                                   (0, None), (None, None)])
+def test_range_skips_unknown_cheques(scored, col, lo, hi):
+    table, idx = scored
+    v = column(table, col, np.float64)
+    known = v > 0                                                  # NaN (Tier U) and 0 = not stated
+    assert (~known).any()
+    want = known & (v >= (-np.inf if lo is None else lo)) & (v <= (np.inf if hi is None else hi))
+    assert idx.range(col, lo, hi).tolist() == np.flatnonzero(want).tolist()
+    assert idx.posting(f"unknown:{col}").tolist() == np.flatnonzero(~known).tolist()
+
+def test_select_upper_bound(scored):
+    table, idx = scored
+    rows = idx.select(cheque_max_le=100_000, stage="preseed")
+    cm = column(table, "cheque_max", np.float64)[rows]
+    assert len(rows) and np.all((cm > 0) & (cm <= 100_000))
@@ -0,0 +1,29 @@
+# Sensitivity grid: the baseline row is the published build, and SF / FC knobs move tiers.
+from pathlib import Path
+
+import pytest
+
+from aix_builder import load_investors, select_country, score_table, tier_counts
+from aix_sensitivity import parse_grid, sensitivity
+
+ROOT = Path(__file__).resolve().parents[1]
+TARGETS = [250_000, 700_000, 1_200_000]
+
+@pytest.fixture(scope="module")
+def fr(tmp_path_factory):
+    return select_country(load_investors(ROOT / "OpenVC.csv", cache_dir=tmp_path_factory.mktemp("cache")), "FR")
+
+def test_baseline_matches_published_counts(fr):
+    rep = sensitivity(fr, TARGETS, parse_grid(""), labels=["250k", "700k", "1200k"])
+    counts = tier_counts(score_table(fr, "FR", TARGETS), ["250k", "700k", "1200k"])
+    for row in rep.to_dict("records"):
+        assert all(row[t] == counts[row["scenario"]].get(t, 0) for t in "ABCU")
+        assert row["topn_kept"] == 1.0
+
+@pytest.mark.parametrize("knob", ["sf_preseed=15,20", "fc_hq=10,15"])
+def test_published_normalisation_keeps_knob_effects(fr, knob):
+    a = sensitivity(fr, TARGETS, parse_grid(knob))
+    b = sensitivity(fr, TARGETS, parse_grid(knob), rescale=True)
+    lower, published = a[a["combo"] == 0], a[a["combo"] == 1]
+    assert lower["A"].sum() < published["A"].sum()
+    assert (b[b["combo"] == 1]["A"].to_numpy() == published["A"].to_numpy()).all()   # baseline either way
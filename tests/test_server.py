@@ -0,0 +1,68 @@
+# aix_server keeps answering while its CSV is replaced (missing, empty, half-written).
+import json, os, shutil, threading
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from aix_server import AixIndex, make_server
+
+ROOT = Path(__file__).resolve().parents[1]
+
+@pytest.fixture
+def server(tmp_path):
+    started = []
+    def start(csv_path):
+        index = AixIndex(csv_path, ["CH"], cache_dir=tmp_path / ".aix_cache")
+        srv, where = make_server(index, port=0)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        started.append(srv)
+        return where
+    yield start
+    for srv in started:
+        srv.shutdown(); srv.server_close()
+
+def get(base, path) -> tuple:
+    try:
+        with urlopen(base + path, timeout=30) as r:
+            return r.status, r.read()
+    except HTTPError as e:
+        return e.code, e.read()
+
+def replace(path, data: bytes):
+    st = os.stat(path)
+    path.write_bytes(data)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))   # new stamp even on coarse clocks
+
+def test_serves_last_index_while_csv_is_replaced(tmp_path, server):
+    src = tmp_path / "OpenVC.csv"
+    shutil.copy(ROOT / "OpenVC.csv", src)
+    base = server(src)
+    status, top = get(base, "/top?country=CH&target=800k")
+    assert status == 200 and json.loads(top)
+
+    good = src.read_bytes()
+    for broken in (b"", good[:len(good) // 2] + b"\xc3", None):              # empty, bad UTF-8, missing
+        if broken is None:
+            src.unlink()
+        else:
+            replace(src, broken)
+        assert get(base, "/top?country=CH&target=800k") == (200, top)
+        assert get(base, "/summary?country=CH&targets=300k")[0] == 200       # not cached: scored on the old index
+        status, health = get(base, "/health")
+        assert status == 200 and json.loads(health)["error"]
+
+    src.write_bytes(good)
+    assert get(base, "/top?country=CH&target=800k") == (200, top)
+    health = json.loads(get(base, "/health")[1])
+    assert health["error"] is None and health["reloads"] == 1
+
+def test_503_until_a_first_load(tmp_path, server):
+    src = tmp_path / "OpenVC.csv"
+    src.write_bytes(b"")
+    base = server(src)
+    assert get(base, "/top?country=CH")[0] == 503
+    assert get(base, "/health")[0] == 200
+    shutil.copy(ROOT / "OpenVC.csv", src)
+    assert get(base, "/top?country=CH")[0] == 200
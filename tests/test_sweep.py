@@ -0,0 +1,42 @@
+# Tier A intervals and tier transitions against score_grid evaluated at every target.
+import numpy as np
+import pytest
+
+from aix_core import score_grid
+from aix_sweep import tier_a_intervals, tier_transitions
+
+T_MAX = 120_000
+
+@pytest.fixture(scope="module")
+def funds():
+    rng = np.random.default_rng(7)
+    n = 400
+    mn = rng.integers(0, 30_000, n) * rng.integers(0, 2, n)
+    mx = mn + rng.integers(0, 50_000, n) * rng.integers(0, 2, n)
+    mx = np.where(rng.random(n) < 0.1, rng.integers(0, 30_000, n), mx)          # some max < min
+    sf, fc, malus = rng.choice([0, 8, 20], n), rng.choice([0, 5, 10, 15], n), rng.choice([0, -5, -10], n)
+    t = np.arange(1, T_MAX + 1, dtype=np.float64)[None, :]
+    g = score_grid(mn[:, None], mx[:, None], sf[:, None], fc[:, None], malus[:, None], t)
+    return (mn, mx, sf, fc, malus), g
+
+def test_tier_a_intervals(funds):
+    args, g = funds
+    a_from, a_to = tier_a_intervals(*args)
+    for i, row in enumerate(g["codes"] == 0):
+        hits = np.flatnonzero(row) + 1
+        if a_from[i] < 0:
+            assert not len(hits), i
+        elif a_to[i] <= T_MAX:                                                   # interval fully in range
+            assert hits.tolist() == list(range(a_from[i], a_to[i] + 1)), i
+
+def test_tier_transitions(funds):
+    args, g = funds
+    ptr, start, aix, code = tier_transitions(*args)
+    t = np.arange(1, T_MAX + 1)
+    ref_aix = np.nan_to_num(g["aix"], nan=-1).astype(np.int64)
+    for i in range(len(ptr) - 1):
+        s = slice(ptr[i], ptr[i + 1])
+        assert start[s][0] == 1 and np.all(np.diff(start[s]) > 0), i
+        j = np.searchsorted(start[s], t, "right") - 1
+        assert np.array_equal(aix[s][j], ref_aix[i]), i
+        assert np.array_equal(code[s][j], g["codes"][i]), i